@@ -3,23 +3,49 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkcalendar import DateEntry, Calendar
 import pandas as pd
+from openpyxl import Workbook
+import hashlib
+import io
 import json
-from datetime import datetime, timedelta
+from datetime import date, datetime
 import random
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 import os
 import traceback
+import threading
 from fpdf import FPDF
 import calendar
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
 from PIL import Image as PILImage
 
-# Initialize the database files
-if not os.path.exists('data'):
-    os.makedirs('data')
+# Prefer orjson for JSON encoding/decoding when it is installed
+try:
+    import orjson
 
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj, compact=False):
+        return orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj, compact=False):
+        if compact:
+            return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Database files
 DB_FILES = {
     'staff': 'data/staff.json',
     'classes': 'data/classes.json',
@@ -28,22 +54,124 @@ DB_FILES = {
     'halls': 'data/halls.json'
 }
 
-# Initialize empty JSON files if they don't exist
-for file_path in DB_FILES.values():
-    if not os.path.exists(file_path):
-        with open(file_path, 'w') as f:
-            json.dump([], f)
+# Parsed staff uploads, keyed by a hash of the workbook so re-uploads skip the Excel parse
+UPLOAD_CACHE_FILE = os.path.join('data', '.staff_cache.json')
+UPLOAD_CACHE_DIR = os.path.join('data', 'staff_uploads')
+UPLOAD_CACHE_SIZE = 5  # Most recently used workbooks kept
+UPLOAD_PARSER_VERSION = 1  # Bump when the sheet parsing rules change, so cached results are not reused
+
+# Default buildings and their classes (read-only, shared by all app instances)
+BUILDINGS = MappingProxyType({
+    'Cit-first floor': ('F1','F3', 'F4','F7', 'F8', 'F9','F22', 'F23'),
+    'Cit-second floor': ('S1', 'S2', 'S3', 'S4', 'S6', 'S7', 'S8', 'S9', 'S10', 'S11', 'S12','S15', 'S16', 'S17', 'S18', 'S20', 'S21', 'S22', 'S23', 'S24', 'S26', 'S27'),
+    'Cit-third floor': ('T1', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7', 'T8', 'T9', 'T10',  'T12', 'T13', 'T14', 'T15', 'T16', 'T17', 'T18', 'T20', 'T21'),
+    'Cit-MT': ('MT1', 'MT2', 'MT3', 'MT4', 'MT5', 'MT6', 'MT7', 'MT8'),
+    'Cit-MS': ('MS1', 'MS2', 'MS3', 'MS4', 'MS5', 'MS6', 'MS7', 'MS8'),
+    'Cit-DH': ('DH1', 'DH2', 'DH3', 'DH4', 'DH5', 'DH6', 'DH7', 'DH8', 'DH9', 'DH10'),
+    'New Block B': ('101', '102', '202', '203', '204', '205'),
+    'New Block C': ('301', '302', '303', '304', '305', '306', '307', '308', '402', 'A', 'B', 'C'),
+    'New Block D': ('501', '502', '503', '504', '506', '507', '508', '509', '601', '602', '603', '604', '605', '606', '607', '608')
+})
+
+# Accepted spellings of staff_gender, upper-cased, mapped to a single-letter code
+GENDER_CODES = MappingProxyType({'F': 'F', 'FEMALE': 'F', 'M': 'M', 'MALE': 'M'})
+
+# Uploaded spreadsheets may also use honorifics in the Gender column
+UPLOAD_GENDER_CODES = MappingProxyType({**GENDER_CODES, 'MR': 'M', 'MS': 'F', 'MRS': 'F'})
+
+def _gender_code(staff):
+    """Return 'F', 'M' or '' for a staff record's gender field"""
+    return GENDER_CODES.get(staff.get('staff_gender', '').strip().upper(), '')
+
+def _normalize_staff(staff):
+    """Return (name, gender code, dept) for a staff record, with gender 'F', 'M' or '' if unrecognised"""
+    return (
+        staff.get('staff_name', '').strip(),
+        _gender_code(staff),
+        staff.get('staff_dept', '').strip()
+    )
+
+def ensure_storage():
+    """Create the data directory and any missing database files"""
+    os.makedirs('data', exist_ok=True)
+    for file_path in DB_FILES.values():
+        if not os.path.exists(file_path):
+            Path(file_path).write_text('[]')
+
+def _write_atomic(path, data):
+    """Write bytes to a temporary file and move it over path so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb', buffering=65536) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+@lru_cache(maxsize=64)
+def _font(family=None, size=None, weight="normal"):
+    """Return a shared CTkFont for the given family, size and weight"""
+    return ctk.CTkFont(family=family, size=size, weight=weight)
+
+# Image assets decoded in the background at startup
+ASSET_PATHS = (
+    r"assets\leftlogo.png",
+    r"assets\rightlogo.png",
+    r"assets\upload staffs.png",
+    r"assets\staff details.png",
+    r"assets\configure class.png",
+    r"assets\allotment.png",
+    r"assets\upload here.png",
+)
+
+@lru_cache(maxsize=None)
+def _load_pil_image(path):
+    """Open and fully decode an image asset, cached per path"""
+    image = PILImage.open(path)
+    image.load()
+    return image
+
+def _preload_assets():
+    """Decode all image assets so first navigation does not wait on disk"""
+    for path in ASSET_PATHS:
+        try:
+            _load_pil_image(path)
+        except Exception as e:
+            print(f"Error preloading {path}: {str(e)}")
+
+@lru_cache(maxsize=64)
+def _load_ctk_image(path, size):
+    """Load an image asset resized to a square of the given size, cached per (path, size)"""
+    image = _load_pil_image(path).resize((size, size))
+    return ctk.CTkImage(light_image=image, size=(size, size))
+
+@dataclass(frozen=True)
+class StaffIndex:
+    """Staff counts derived from staff.json and the exclusion list"""
+    total: int
+    available: int
+    female: int  # available female staff
+    male: int  # available male staff
+    female_total: int
+    male_total: int
 
 class ConfigurationManager:
-    def __init__(self):
+    # Delay before pending changes are written to disk
+    FLUSH_DELAY_MS = 500
+
+    def __init__(self, root=None):
         self.configurations = {}  # Start empty, don't load anything
+        self.root = root  # Tk root used to schedule deferred saves
+        self._dirty = False
+        self._flush_after_id = None
+        # Create the data directory and files once, so flushes only have to write
+        ensure_storage()
 
     def load_configurations(self):
         """Load configurations from file"""
         try:
-            if os.path.exists(DB_FILES['classes']):
-                with open(DB_FILES['classes'], 'r') as f:
-                    self.configurations = json.load(f)
+            self.configurations = _json_loads(Path(DB_FILES['classes']).read_bytes() or b'{}')
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Error loading configurations: {str(e)}")
             self.configurations = {}
@@ -51,12 +179,9 @@ class ConfigurationManager:
     def save_configurations(self):
         """Save configurations to file"""
         try:
-            # Ensure data directory exists
-            os.makedirs(os.path.dirname(DB_FILES['classes']), exist_ok=True)
-            
-            # Save configurations
-            with open(DB_FILES['classes'], 'w') as f:
-                json.dump(self.configurations, f, indent=4)
+            # Save configurations, encoded in memory and swapped in atomically
+            _write_atomic(DB_FILES['classes'], _json_dumps(self.configurations))
+            self._dirty = False
             return True
         except Exception as e:
             print(f"Error saving configurations: {str(e)}")
@@ -76,8 +201,35 @@ class ConfigurationManager:
 
     def set_date_config(self, date, config):
         """Set configuration for a specific date"""
-        self.configurations[date] = config
-        return self.save_configurations()
+        return self.set_many({date: config})
+
+    def set_many(self, updates):
+        """Set configurations for several dates, saved with a single write"""
+        self.configurations.update(updates)
+        self._dirty = True
+        if self.root is None:
+            return self.save_configurations()
+
+        # Coalesce bursts of edits into a single write
+        if self._flush_after_id is not None:
+            self.root.after_cancel(self._flush_after_id)
+        self._flush_after_id = self.root.after(self.FLUSH_DELAY_MS, self._flush)
+        return True
+
+    def _flush(self):
+        """Write pending changes scheduled by set_date_config"""
+        self._flush_after_id = None
+        if self._dirty:
+            self.save_configurations()
+
+    def flush(self):
+        """Write any pending changes to file immediately"""
+        if self._flush_after_id is not None:
+            try:
+                self.root.after_cancel(self._flush_after_id)
+            except tk.TclError:
+                pass
+        return self._flush()
 
     def get_all_dates(self):
         """Get list of all configured dates"""
@@ -121,24 +273,21 @@ class DateSelectionDialog(ctk.CTkToplevel):
     def __init__(self, parent, dates):
         super().__init__(parent)
         
-        self.title("Select Dates")
-        self.geometry("500x600")
+        # Keep the dialog hidden while its widgets are built
+        self.withdraw()
         
-        # Center the dialog
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-        x = (self.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f'+{x}+{y}')
+        self.title("Select Dates")
         
-        # Make dialog modal
-        self.transient(parent)
-        self.grab_set()
+        # Center the dialog using its fixed size
+        width, height = 500, 600
+        x = (self.winfo_screenwidth() - width) // 2
+        y = (self.winfo_screenheight() - height) // 2
+        self.geometry(f'{width}x{height}+{x}+{y}')
         
         # Store dates
         self.dates = dates
         self.selected_dates = []
+        self._checked_dates = set()  # Kept in sync by variable traces
         
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -147,17 +296,25 @@ class DateSelectionDialog(ctk.CTkToplevel):
         # Create UI
         self.create_widgets()
         
+        # Lay out everything in one pass, then show the dialog
+        self.update_idletasks()
+        self.deiconify()
+        
+        # Make dialog modal (grab requires the window to be visible)
+        self.transient(parent)
+        self.grab_set()
+        
     def create_widgets(self):
         # Title
         title_label = ctk.CTkLabel(self, 
                                text="Select Dates for Configuration",
-                               font=ctk.CTkFont(size=24, weight="bold"))
+                               font=_font(size=24, weight="bold"))
         title_label.grid(row=0, column=0, pady=(20,10), padx=20, sticky="ew")
         
         # Subtitle
         subtitle_label = ctk.CTkLabel(self,
                                   text="Choose the dates to apply this configuration to:",
-                                  font=ctk.CTkFont(size=16))
+                                  font=_font(size=16))
         subtitle_label.grid(row=1, column=0, pady=(0,20), padx=20, sticky="ew")
         
         # Create scrollable frame
@@ -168,19 +325,16 @@ class DateSelectionDialog(ctk.CTkToplevel):
         # Create checkboxes for dates
         self.date_vars = {}
         for i, date in enumerate(sorted(self.dates)):
-            frame = ctk.CTkFrame(scroll_frame)
-            frame.grid(row=i, column=0, sticky="ew", pady=5)
-            frame.grid_columnconfigure(0, weight=1)
-            
             var = tk.BooleanVar()
-            cb = ctk.CTkCheckBox(frame,
+            cb = ctk.CTkCheckBox(scroll_frame,
                              text=date,
                              variable=var,
-                             font=ctk.CTkFont(size=14),
+                             font=_font(size=14),
                              height=40,
                              checkbox_width=24,
                              checkbox_height=24)
-            cb.grid(row=0, column=0, padx=10, sticky="w")
+            cb.grid(row=i, column=0, padx=10, pady=5, sticky="w")
+            var.trace_add('write', lambda *args, d=date: self._on_toggle(d))
             self.date_vars[date] = var
             
         # Button frame
@@ -190,14 +344,14 @@ class DateSelectionDialog(ctk.CTkToplevel):
         
         # Select All button
         def select_all():
-            select_all = not all(var.get() for var in self.date_vars.values())
+            select_all = len(self._checked_dates) != len(self.date_vars)
             for var in self.date_vars.values():
                 var.set(select_all)
                 
         select_all_btn = ctk.CTkButton(btn_frame,
                                    text="Select All",
                                    command=select_all,
-                                   font=ctk.CTkFont(size=14),
+                                   font=_font(size=14),
                                    width=120,
                                    height=40)
         select_all_btn.grid(row=0, column=0, padx=10)
@@ -206,7 +360,7 @@ class DateSelectionDialog(ctk.CTkToplevel):
         cancel_btn = ctk.CTkButton(btn_frame,
                                text="Cancel",
                                command=self.cancel,
-                               font=ctk.CTkFont(size=14),
+                               font=_font(size=14),
                                width=120,
                                height=40,
                                fg_color="#FF5555",
@@ -217,27 +371,47 @@ class DateSelectionDialog(ctk.CTkToplevel):
         apply_btn = ctk.CTkButton(btn_frame,
                               text="Apply",
                               command=self.apply,
-                              font=ctk.CTkFont(size=14),
+                              font=_font(size=14),
                               width=120,
                               height=40,
                               fg_color="#00B056",
                               hover_color="#009048")
         apply_btn.grid(row=0, column=2, padx=10)
         
+    def _on_toggle(self, date):
+        """Track which dates are checked whenever a checkbox variable changes"""
+        if self.date_vars[date].get():
+            self._checked_dates.add(date)
+        else:
+            self._checked_dates.discard(date)
+
     def cancel(self):
         self.selected_dates = []
         self.destroy()
         
     def apply(self):
-        self.selected_dates = [date for date, var in self.date_vars.items() if var.get()]
+        self.selected_dates = [date for date in self.date_vars if date in self._checked_dates]
         if not self.selected_dates:
             messagebox.showerror("Error", "Please select at least one date")
             return
         self.destroy()
 
 class ExamDutyApp:
+    # Department boxes created per pass when filling the statistics view
+    DEPT_BATCH_SIZE = 20
+    # Buildings (with all their class checkboxes) created per pass on the class selection page
+    BUILDING_BATCH_SIZE = 3
+    # Delay between passes, long enough for Tk to draw the previous batch
+    BATCH_DELAY_MS = 10
+    # How often the UI thread checks on a staff upload running in the background
+    UPLOAD_POLL_MS = 50
     def __init__(self):
         """Initialize the application"""
+        ensure_storage()
+        
+        # Decode image assets off the main thread while the UI is built
+        threading.Thread(target=_preload_assets, daemon=True).start()
+        
         self.app = ctk.CTk()
         self.app.title("Staff Allotment")
         
@@ -268,56 +442,233 @@ class ExamDutyApp:
             'width': 200,
             'height': 40,
             'corner_radius': 8,
-            'font': ctk.CTkFont(family="Arial", size=14, weight="bold"),
+            'font': _font(family="Arial", size=14, weight="bold"),
             'fg_color': self.UI_THEME['button_bg'],
             'text_color': self.UI_THEME['button_fg'],
             'hover_color': self.UI_THEME['button_hover'],
             'border_color': self.UI_THEME['button_border'],
             'border_width': 2
         }
+
+        # Style shared by the statistics boxes
+        self.STATS_STYLE = {
+            'fg_color': self.UI_THEME['header_bg'],
+            'corner_radius': 8,
+            'border_width': 1,
+            'border_color': self.UI_THEME['button_border']
+        }
+
+        # Smaller fixed-size statistics boxes on the class configuration page
+        self.STAT_BOX_STYLE = {
+            **self.STATS_STYLE,
+            'width': 120,
+            'height': 80
+        }
+
+        # Building and class checkboxes on the class selection page
+        self.BUILDING_CHECKBOX_STYLE = {
+            'font': _font(family="Arial", size=14, weight="bold"),
+            'text_color': "#ffffff",  # White text for building name
+            'fg_color': "#ffffff",    # White when checked
+            'hover_color': "#cccccc", # Light gray on hover
+            'border_color': "#ffffff", # White border
+            'border_width': 2,
+            'checkmark_color': "#000000"  # Black checkmark for contrast
+        }
+        self.CLASS_CHECKBOX_STYLE = {
+            'font': _font(family="Arial", size=12),
+            'text_color': self.UI_THEME['button_fg'],
+            'fg_color': "#000000",  # Color when checked
+            'hover_color': "#333333",  # Slightly lighter black on hover
+            'border_color': self.UI_THEME['button_border'],
+            'border_width': 2,
+            'checkmark_color': "#ffffff"  # White checkmark
+        }
+
+        # Exam details form styles
+        self.FORM_LABEL_STYLE = {
+            'font': _font(family="Arial", size=14, weight="bold"),
+            'text_color': self.UI_THEME['button_fg']
+        }
+        self.FORM_ENTRY_STYLE = {
+            'font': _font(family="Arial", size=13),
+            'height': 40,
+            'corner_radius': 8,
+            'border_width': 2,
+            'border_color': self.UI_THEME['button_border'],
+            'fg_color': "#ffffff",
+            'text_color': "#000000",
+            'placeholder_text_color': "#666666"
+        }
+        self.FORM_BUTTON_STYLE = {
+            'font': _font(family="Arial", size=14, weight="bold"),
+            'width': 150,
+            'height': 40,
+            'corner_radius': 8,
+            'border_width': 2,
+            'border_color': self.UI_THEME['button_border']
+        }
+
+        # Staff list button styles for staff included in and excluded from allotment
+        staff_button_style = {
+            'width': 250,
+            'height': 35,
+            'corner_radius': 8,
+            'font': _font(family="Arial", size=13),
+            'border_color': "#000000",
+            'border_width': 2
+        }
+        self.STAFF_BUTTON_ACTIVE = {
+            **staff_button_style,
+            'fg_color': "#000000",
+            'text_color': "#ffffff",
+            'hover_color': "#333333"
+        }
+        self.STAFF_BUTTON_EXCLUDED = {
+            **staff_button_style,
+            'fg_color': "#ffffff",
+            'text_color': "#000000",
+            'hover_color': "#f0f0f0"
+        }
+
+        # PDF title styles, built once from the sample sheet and reused by every document
+        sample_title = getSampleStyleSheet()['Title']
+        self.PDF_TITLE_STYLE = ParagraphStyle(
+            'AllotmentTitle', parent=sample_title,
+            alignment=1,  # Center alignment
+            spaceAfter=30, fontSize=12, leading=16
+        )
+        self.REPORT_TITLE_STYLE = ParagraphStyle('ReportTitle', parent=sample_title, alignment=1)
         
         # Initialize variables
-        self.selected_dates = []
+        self.selected_dates = {}  # Date strings in order, mapped to their row on the date selection page
         self.current_date = None
         self.room_frames = {}
+        self.building_vars = {}
+        self.class_vars = {}
         self.reporting_time_var = tk.StringVar()
         self.assessment_name_var = tk.StringVar()
         self.exam_month_var = tk.StringVar()
         self.exam_details_var = tk.StringVar()
         
+        # Staff grouped by department, cached until staff.json changes
+        self._staff_cache = None
+        self._staff_mtime = None
+        self._sorted_depts = []
+        self._staff_list = []
+        
+        # Parsed JSON files keyed by path, each stored with the mtime it was read at
+        self._json_cache = {}
+        
+        # Background loads that warm the JSON cache before the pages that need it are opened
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._preload_futures = {}
+        self._preload_json('halls')
+        self._preload_json('staff')
+        
+        # Staff counts, rebuilt when staff.json or excluded_staff.json changes
+        self._staff_index = None
+        self._staff_index_key = None
+        
+        # Staff excluded from allotment, cached until excluded_staff.json changes
+        self._excluded_staff = frozenset()
+        self._excluded_mtime = None
+        self._staff_buttons = {}
+        
+        # Statistics view widgets, reused while the staff details page is open
+        self._stats_view = None
+        
+        # Class settings view, reused while the class configuration page is open
+        self._class_config_view = None
+
+        # Hall details view widgets, reused while a hall is shown on the room configuration page
+        self._hall_view = None
+        self._hall_buttons = {}
+
+        # Background staff upload, if one is running, and the upload page it was started from
+        self._upload_future = None
+        self._upload_page = None
+
+        # Halls edited on the room configuration page, read once and written back on change
+        self._halls = None
+        self._halls_index = {}
+
+        # Halls referenced by allotment.json, tied to the parsed data they were built from
+        self._allotment_halls = set()
+        self._allotment_halls_source = None
+        
         # Configuration manager
-        self.config_manager = ConfigurationManager()
+        self.config_manager = ConfigurationManager(self.app)
+        self.app.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Building and class configuration
-        self.buildings = {
-            'Cit-first floor': ['F1','F3', 'F4','F7', 'F8', 'F9','F22', 'F23'],
-            'Cit-second floor': ['S1', 'S2', 'S3', 'S4', 'S6', 'S7', 'S8', 'S9', 'S10', 'S11', 'S12','S15', 'S16', 'S17', 'S18', 'S20', 'S21', 'S22', 'S23', 'S24', 'S26', 'S27'],
-            'Cit-third floor': ['T1', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7', 'T8', 'T9', 'T10',  'T12', 'T13', 'T14', 'T15', 'T16', 'T17', 'T18', 'T20', 'T21'],
-            'Cit-MT': ['MT1', 'MT2', 'MT3', 'MT4', 'MT5', 'MT6', 'MT7', 'MT8'],
-            'Cit-MS': ['MS1', 'MS2', 'MS3', 'MS4', 'MS5', 'MS6', 'MS7', 'MS8'],
-            'Cit-DH': ['DH1', 'DH2', 'DH3', 'DH4', 'DH5', 'DH6', 'DH7', 'DH8', 'DH9', 'DH10'],
-            'New Block B': ['101', '102', '202', '203', '204', '205'],
-            'New Block C': ['301', '302', '303', '304', '305', '306', '307', '308', '402', 'A', 'B', 'C'],
-            'New Block D': ['501', '502', '503', '504', '506', '507', '508', '509', '601', '602', '603', '604', '605', '606', '607', '608']
-        }
+        self.buildings = None
+        self.set_buildings(BUILDINGS)
+        
+        # Pages that are kept alive and re-packed instead of rebuilt
+        self._pages = {}
+        self._home_size = None
         
         self.create_home_page()
 
+    def set_buildings(self, buildings):
+        """Set the building -> classes mapping and rebuild the lookups derived from it"""
+        # Cached halls.json data is the same object until the file changes, so nothing to rebuild
+        if buildings is self.buildings:
+            return
+        self.buildings = buildings
+        self._sorted_buildings = sorted(buildings.keys())
+        self._sorted_classes_by_building = {building: sorted(rooms) for building, rooms in buildings.items()}
+
+    def _ensure_vars(self):
+        """Create selection variables for the current buildings and classes, keeping existing ones"""
+        building_vars = {}
+        class_vars = {}
+        for building_name, classes in self.buildings.items():
+            var = self.building_vars.get(building_name)
+            building_vars[building_name] = var if var is not None else tk.BooleanVar()
+            for class_name in classes:
+                var = self.class_vars.get(class_name)
+                class_vars[class_name] = var if var is not None else tk.BooleanVar()
+
+        # Drop variables for buildings and classes that no longer exist
+        self.building_vars = building_vars
+        self.class_vars = class_vars
+
+    def _clear_window(self):
+        """Hide cached pages and destroy all other widgets in the main window"""
+        cached_pages = list(self._pages.values())
+        for widget in self.app.winfo_children():
+            if any(widget is page for page in cached_pages):
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
     def create_home_page(self):
         # Clear existing widgets
-        for widget in self.app.winfo_children():
-            widget.destroy()
+        self._clear_window()
 
         # Configure the main window
         self.app.configure(fg_color="#ffffff")
 
-        # Create main container with responsive padding
-        main_container = ctk.CTkFrame(self.app, fg_color="transparent")
-        main_container.pack(fill="both", expand=True, padx=40, pady=30)
-
         # Calculate responsive dimensions
         window_width = self.app.winfo_width()
         window_height = self.app.winfo_height()
+
+        # Reuse the home page unless the window size it was laid out for has changed
+        home_page = self._pages.get('home')
+        if home_page is not None:
+            if self._home_size == (window_width, window_height):
+                home_page.pack(fill="both", expand=True, padx=40, pady=30)
+                return
+            del self._pages['home']
+            home_page.destroy()
+
+        # Create main container with responsive padding
+        main_container = ctk.CTkFrame(self.app, fg_color="transparent")
+        main_container.pack(fill="both", expand=True, padx=40, pady=30)
+        self._pages['home'] = main_container
+        self._home_size = (window_width, window_height)
         
         # Increased header height
         header_height = min(150, int(window_height * 0.22))  # Increased from 120 to 150
@@ -325,49 +676,19 @@ class ExamDutyApp:
         # Increased logo size
         logo_size = min(100, int(header_height * 0.8))  # Increased from 80 to 100 and ratio from 0.7 to 0.8
 
-        # Header Frame with logos - responsive height
-        header_frame = ctk.CTkFrame(
-            main_container, 
-            fg_color="#000000", 
-            corner_radius=15,
-            height=header_height
-        )
-        header_frame.pack(fill="x", padx=20, pady=(0, int(window_height * 0.05)))
-
-        # Create a frame for header content with grid layout
-        header_content = ctk.CTkFrame(header_frame, fg_color="transparent")
-        header_content.pack(fill="x", pady=20, padx=20)  # Increased padding
-        header_content.grid_columnconfigure(1, weight=1)
-
-        # Load and add left logo with responsive size
-        try:
-            left_logo = PILImage.open(r"assets\leftlogo.png")
-            left_logo = left_logo.resize((logo_size, logo_size))
-            left_logo_ctk = ctk.CTkImage(light_image=left_logo, size=(logo_size, logo_size))
-            left_logo_label = ctk.CTkLabel(header_content, image=left_logo_ctk, text="")
-            left_logo_label.grid(row=0, column=0, padx=(0, 30))  # Increased padding
-        except Exception as e:
-            print(f"Error loading left logo: {e}")
-
         # Title with larger responsive font size
         title_size = max(32, min(42, int(window_height * 0.06)))  # Increased minimum and maximum font sizes
-        title = ctk.CTkLabel(
-            header_content,
-            text="STAFF ALLOTMENT SYSTEM",
-            font=ctk.CTkFont(family="Arial", size=title_size, weight="bold"),
-            text_color="#ffffff"
-        )
-        title.grid(row=0, column=1)
 
-        # Load and add right logo with responsive size
-        try:
-            right_logo = PILImage.open(r"assets\rightlogo.png")
-            right_logo = right_logo.resize((logo_size, logo_size))
-            right_logo_ctk = ctk.CTkImage(light_image=right_logo, size=(logo_size, logo_size))
-            right_logo_label = ctk.CTkLabel(header_content, image=right_logo_ctk, text="")
-            right_logo_label.grid(row=0, column=2, padx=(30, 0))  # Increased padding
-        except Exception as e:
-            print(f"Error loading right logo: {e}")
+        # Header with logos - responsive sizes
+        self.create_header(
+            main_container,
+            "STAFF ALLOTMENT SYSTEM",
+            logo_size=logo_size,
+            title_size=title_size,
+            spacing=30,
+            content_pady=20,
+            bottom_pady=int(window_height * 0.05)
+        )
 
         # Calculate responsive button dimensions - with minimum sizes to prevent too small buttons
         button_width = max(300, min(380, int(window_width * 0.25)))  # Minimum 300px, Maximum 380px
@@ -390,7 +711,7 @@ class ExamDutyApp:
             "width": button_width,
             "height": button_height,
             "corner_radius": 15,
-            "font": ctk.CTkFont(family="Arial", size=button_font_size, weight="bold"),
+            "font": _font(family="Arial", size=button_font_size, weight="bold"),
             "fg_color": "#ffffff",
             "hover_color": "#f0f0f0",
             "text_color": "#000000",
@@ -400,25 +721,10 @@ class ExamDutyApp:
 
         # Load and resize button icons
         try:
-            # Upload icon
-            upload_image = PILImage.open(r"assets\upload staffs.png")
-            upload_image = upload_image.resize((icon_size, icon_size))
-            upload_image = ctk.CTkImage(light_image=upload_image, size=(icon_size, icon_size))
-
-            # Staff icon
-            staff_image = PILImage.open(r"assets\staff details.png")
-            staff_image = staff_image.resize((icon_size, icon_size))
-            staff_image = ctk.CTkImage(light_image=staff_image, size=(icon_size, icon_size))
-
-            # Configure icon
-            configure_image = PILImage.open(r"assets\configure class.png")
-            configure_image = configure_image.resize((icon_size, icon_size))
-            configure_image = ctk.CTkImage(light_image=configure_image, size=(icon_size, icon_size))
-
-            # Allotment icon
-            allotment_image = PILImage.open(r"assets\allotment.png")
-            allotment_image = allotment_image.resize((icon_size, icon_size))
-            allotment_image = ctk.CTkImage(light_image=allotment_image, size=(icon_size, icon_size))
+            upload_image = _load_ctk_image(r"assets\upload staffs.png", icon_size)
+            staff_image = _load_ctk_image(r"assets\staff details.png", icon_size)
+            configure_image = _load_ctk_image(r"assets\configure class.png", icon_size)
+            allotment_image = _load_ctk_image(r"assets\allotment.png", icon_size)
         except Exception as e:
             upload_image = staff_image = configure_image = allotment_image = None
             print(f"Error loading button icons: {e}")
@@ -472,46 +778,41 @@ class ExamDutyApp:
         footer_text = ctk.CTkLabel(
             footer_frame,
             text=" 2024 Staff Allotment System",
-            font=ctk.CTkFont(family="Arial", size=12),
+            font=_font(family="Arial", size=12),
             text_color="#666666"
         )
         footer_text.pack(pady=10)
 
-    def create_header(self, container, title_text):
+    def create_header(self, container, title_text, logo_size=60, title_size=28,
+                      spacing=20, content_pady=15, bottom_pady=40):
         """Create consistent header with logos and title"""
         header_frame = ctk.CTkFrame(container, fg_color=self.UI_THEME['header_bg'], corner_radius=15)
-        header_frame.pack(fill="x", padx=20, pady=(0, 40))
+        header_frame.pack(fill="x", padx=20, pady=(0, bottom_pady))
         
-        header_content = ctk.CTkFrame(header_frame, fg_color="transparent")
-        header_content.pack(fill="x", pady=15, padx=20)
-        header_content.grid_columnconfigure(1, weight=1)
+        header_frame.grid_columnconfigure(1, weight=1)
 
         # Left logo
         try:
-            left_logo = PILImage.open(r"assets\leftlogo.png")
-            left_logo = left_logo.resize((60, 60))
-            left_logo_ctk = ctk.CTkImage(light_image=left_logo, size=(60, 60))
-            left_logo_label = ctk.CTkLabel(header_content, image=left_logo_ctk, text="")
-            left_logo_label.grid(row=0, column=0, padx=(0, 20))
+            left_logo_ctk = _load_ctk_image(r"assets\leftlogo.png", logo_size)
+            left_logo_label = ctk.CTkLabel(header_frame, image=left_logo_ctk, text="")
+            left_logo_label.grid(row=0, column=0, padx=(20, spacing), pady=content_pady)
         except Exception as e:
             print(f"Error loading left logo: {e}")
 
         # Title
         title = ctk.CTkLabel(
-            header_content,
+            header_frame,
             text=title_text,
-            font=ctk.CTkFont(family="Arial", size=28, weight="bold"),
+            font=_font(family="Arial", size=title_size, weight="bold"),
             text_color=self.UI_THEME['header_fg']
         )
-        title.grid(row=0, column=1)
+        title.grid(row=0, column=1, pady=content_pady)
 
         # Right logo
         try:
-            right_logo = PILImage.open(r"assets\right logo.png")
-            right_logo = right_logo.resize((60, 60))
-            right_logo_ctk = ctk.CTkImage(light_image=right_logo, size=(60, 60))
-            right_logo_label = ctk.CTkLabel(header_content, image=right_logo_ctk, text="")
-            right_logo_label.grid(row=0, column=2, padx=(20, 0))
+            right_logo_ctk = _load_ctk_image(r"assets\rightlogo.png", logo_size)
+            right_logo_label = ctk.CTkLabel(header_frame, image=right_logo_ctk, text="")
+            right_logo_label.grid(row=0, column=2, padx=(spacing, 20), pady=content_pady)
         except Exception as e:
             print(f"Error loading right logo: {e}")
 
@@ -519,16 +820,20 @@ class ExamDutyApp:
 
     def show_upload_staff(self):
         # Clear existing widgets
-        for widget in self.app.winfo_children():
-            widget.destroy()
+        self._clear_window()
 
         # Create main container
         main_container = ctk.CTkFrame(self.app, fg_color="transparent")
         main_container.pack(fill="both", expand=True, padx=40, pady=30)
+        self._upload_page = main_container
 
         # Add header
         self.create_header(main_container, "UPLOAD STAFF DETAILS")
 
+        # Window size used for responsive sizing below
+        window_width = self.app.winfo_width()
+        window_height = self.app.winfo_height()
+
         # Content Frame with border
         content_frame = ctk.CTkFrame(
             main_container, 
@@ -545,21 +850,23 @@ class ExamDutyApp:
 
         # Upload icon - make it responsive
         try:
-            upload_icon = PILImage.open(r"assets\upload here.png")
-            icon_size = min(100, int(self.app.winfo_height() * 0.15))  # Responsive icon size
-            upload_icon = upload_icon.resize((icon_size, icon_size))
-            upload_icon_ctk = ctk.CTkImage(light_image=upload_icon, size=(icon_size, icon_size))
+            icon_size = min(100, int(window_height * 0.15))  # Responsive icon size
+            upload_icon_ctk = _load_ctk_image(r"assets\upload here.png", icon_size)
             upload_icon_label = ctk.CTkLabel(center_frame, image=upload_icon_ctk, text="")
             upload_icon_label.pack(pady=(0, 20))
         except Exception as e:
             print(f"Error loading upload icon: {e}")
 
         # Instructions with responsive font size
-        font_size = min(14, int(self.app.winfo_height() * 0.02))
+        font_size = min(14, int(window_height * 0.02))
         instructions = ctk.CTkLabel(
             center_frame,
-            text="Upload Excel file with staff details\nEach department should be in a separate sheet",
-            font=ctk.CTkFont(family="Arial", size=font_size),
+            text=(
+                "Upload Excel file with staff details\nEach department should be in a separate sheet\n\n"
+                f"Parsed copies of the last {UPLOAD_CACHE_SIZE} uploads are kept in {UPLOAD_CACHE_DIR}\n"
+                "so uploading the same file again is instant."
+            ),
+            font=_font(family="Arial", size=font_size),
             text_color=self.UI_THEME['button_fg']
         )
         instructions.pack(pady=(0, 40))
@@ -569,12 +876,12 @@ class ExamDutyApp:
         button_frame.pack(pady=20)
 
         # Calculate button width based on window size
-        button_width = min(200, int(self.app.winfo_width() * 0.2))
+        button_width = min(200, int(window_width * 0.2))
         button_style = {
             **self.BUTTON_STYLE,
             'width': button_width,
             'height': 40,
-            'font': ctk.CTkFont(family="Arial", size=font_size, weight="bold")
+            'font': _font(family="Arial", size=font_size, weight="bold")
         }
 
         # Upload button
@@ -598,11 +905,110 @@ class ExamDutyApp:
         # Make the content vertically centered
         center_frame.pack_configure(expand=True)
 
+    def _load_staff_by_dept(self):
+        """Load staff grouped by department, reusing the cached result while staff.json is unchanged"""
+        mtime = os.stat(DB_FILES['staff']).st_mtime_ns
+        if self._staff_cache is None or mtime != self._staff_mtime:
+            staff_list = self._load_json(DB_FILES['staff'])
+
+            # Group staff by department
+            dept_staff = defaultdict(list)
+            for staff in staff_list:
+                dept_staff[staff.get('staff_dept', '').strip()].append(staff)
+
+            # Normalized (name, gender, dept) tuples, built once per staff.json change
+            self._staff_list = [_normalize_staff(staff) for staff in staff_list]
+
+            self._staff_cache = dept_staff
+            self._sorted_depts = sorted(dept_staff.keys())
+            self._staff_mtime = mtime
+        return self._staff_cache
+
+    def _get_staff_list(self):
+        """Return the normalized staff list, sharing the staff.json cache"""
+        self._load_staff_by_dept()
+        return self._staff_list
+
+    def _load_json(self, path):
+        """Load a JSON file, reusing the parsed data while the file's mtime is unchanged"""
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        data = _json_loads(Path(path).read_bytes())
+        self._json_cache[path] = (mtime, data)
+        return data
+
+    def _rebuild_staff_index(self, staff_list, excluded_staff):
+        """Count staff by availability and gender in a single pass over normalized (name, gender, dept) tuples"""
+        total = available = female = male = female_total = male_total = 0
+        for name, gender, dept in staff_list:
+            total += 1
+            is_female = gender == 'F'
+            is_male = gender == 'M'
+            female_total += is_female
+            male_total += is_male
+            if name not in excluded_staff:
+                available += 1
+                female += is_female
+                male += is_male
+        return StaffIndex(
+            total=total,
+            available=available,
+            female=female,
+            male=male,
+            female_total=female_total,
+            male_total=male_total
+        )
+
+    def _get_staff_index(self):
+        """Return the StaffIndex for staff.json, rebuilt only when it or excluded_staff.json changes"""
+        staff_stat = os.stat(DB_FILES['staff'])
+        excluded_staff = self._get_excluded_staff()
+        key = (staff_stat.st_mtime_ns, self._excluded_mtime)
+        if self._staff_index is None or self._staff_index_key != key:
+            self._staff_index = self._rebuild_staff_index(self._get_staff_list(), excluded_staff)
+            self._staff_index_key = key
+        return self._staff_index
+
+    def _preload_json(self, key):
+        """Start loading a database file into the JSON cache on a background thread"""
+        self._preload_futures[key] = self._io_pool.submit(self._load_json, DB_FILES[key])
+
+    def _wait_preload(self, key):
+        """Wait for a background load of a database file, if one is still pending"""
+        future = self._preload_futures.pop(key, None)
+        if future is not None:
+            # Errors are left for the caller's own _load_json call to report
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def _get_excluded_staff(self):
+        """Return a frozenset of staff excluded from allotment, re-reading the file only when it changes"""
+        excluded_staff_file = os.path.join('data', 'excluded_staff.json')
+        try:
+            mtime = os.stat(excluded_staff_file).st_mtime_ns
+        except FileNotFoundError:
+            self._excluded_staff = frozenset()
+            self._excluded_mtime = None
+            return self._excluded_staff
+
+        if mtime != self._excluded_mtime:
+            try:
+                with open(excluded_staff_file, 'rb') as f:
+                    self._excluded_staff = frozenset(name.strip() for name in _json_loads(f.read()))
+            except:
+                self._excluded_staff = frozenset()
+            self._excluded_mtime = mtime
+        return self._excluded_staff
+
     def show_staff_details(self):
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
 
             # Configure the main window
             self.app.configure(fg_color="#ffffff")
@@ -611,43 +1017,8 @@ class ExamDutyApp:
             main_container = ctk.CTkFrame(self.app, fg_color="transparent")
             main_container.pack(fill="both", expand=True, padx=40, pady=30)
 
-            # Header Frame
-            header_frame = ctk.CTkFrame(main_container, fg_color="#000000", corner_radius=15)
-            header_frame.pack(fill="x", padx=20, pady=(0, 40))
-            
-            # Create a frame for header content with grid layout
-            header_content = ctk.CTkFrame(header_frame, fg_color="transparent")
-            header_content.pack(fill="x", pady=15, padx=20)
-            header_content.grid_columnconfigure(1, weight=1)
-
-            # Load and add left logo
-            try:
-                left_logo = PILImage.open(r"assets\leftlogo.png")
-                left_logo = left_logo.resize((60, 60))
-                left_logo_ctk = ctk.CTkImage(light_image=left_logo, size=(60, 60))
-                left_logo_label = ctk.CTkLabel(header_content, image=left_logo_ctk, text="")
-                left_logo_label.grid(row=0, column=0, padx=(0, 20))
-            except Exception as e:
-                print(f"Error loading left logo: {e}")
-
-            # Title with enhanced styling
-            title = ctk.CTkLabel(
-                header_content,
-                text="STAFF DETAILS AND STATISTICS",
-                font=ctk.CTkFont(family="Arial", size=28, weight="bold"),
-                text_color="#ffffff"
-            )
-            title.grid(row=0, column=1)
-
-            # Load and add right logo
-            try:
-                right_logo = PILImage.open(r"\assets\right logo.png")
-                right_logo = right_logo.resize((60, 60))
-                right_logo_ctk = ctk.CTkImage(light_image=right_logo, size=(60, 60))
-                right_logo_label = ctk.CTkLabel(header_content, image=right_logo_ctk, text="")
-                right_logo_label.grid(row=0, column=2, padx=(20, 0))
-            except Exception as e:
-                print(f"Error loading right logo: {e}")
+            # Add header
+            self.create_header(main_container, "STAFF DETAILS AND STATISTICS")
 
             # Content container with two panels
             content_container = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -664,12 +1035,16 @@ class ExamDutyApp:
             right_panel.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
 
             # Check if staff data exists
-            if not os.path.exists("data/staff.json") or os.path.getsize("data/staff.json") == 0:
+            try:
+                staff_file_empty = os.stat("data/staff.json").st_size == 0
+            except FileNotFoundError:
+                staff_file_empty = True
+            if staff_file_empty:
                 # Show message to upload staff details
                 message_label = ctk.CTkLabel(
                     main_container,
                     text="No staff details available.\nPlease upload staff details first.",
-                    font=ctk.CTkFont(size=16)
+                    font=_font(size=16)
                 )
                 message_label.pack(pady=20)
                 
@@ -680,7 +1055,7 @@ class ExamDutyApp:
                     command=self.show_upload_staff,
                     width=200,
                     height=40,
-                    font=ctk.CTkFont(size=14)
+                    font=_font(size=14)
                 )
                 upload_btn.pack(pady=10)
                 
@@ -691,28 +1066,19 @@ class ExamDutyApp:
                     command=self.create_home_page,
                     width=200,
                     height=40,
-                    font=ctk.CTkFont(size=14)
+                    font=_font(size=14)
                 )
                 back_btn.pack(pady=10)
                 return
 
-            # Load staff data
-            with open("data/staff.json", 'r') as f:
-                staff_list = json.load(f)
-
-            # Group staff by department
-            dept_staff = {}
-            for staff in staff_list:
-                dept = staff.get('staff_dept', '').strip()
-                if dept not in dept_staff:
-                    dept_staff[dept] = []
-                dept_staff[dept].append(staff)
+            # Load staff data grouped by department
+            dept_staff = self._load_staff_by_dept()
 
             # Left Panel - Department-wise Staff List
             left_title = ctk.CTkLabel(
                 left_panel,
                 text="STAFF LIST BY DEPARTMENT",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
+                font=_font(family="Arial", size=16, weight="bold"),
                 text_color="#000000"
             )
             left_title.pack(pady=15)
@@ -721,16 +1087,14 @@ class ExamDutyApp:
             staff_frame = ctk.CTkScrollableFrame(left_panel, fg_color="transparent")
             staff_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
-            # Button style for staff list
-            staff_button_config = {
-                "width": 250,
-                "height": 35,
-                "corner_radius": 8,
-                "font": ctk.CTkFont(family="Arial", size=13)
-            }
+            # Load excluded staff list
+            excluded_staff = self._get_excluded_staff()
+
+            # Staff buttons by name, so toggling allotment can recolor a single button
+            self._staff_buttons = {}
 
             # Add staff list department-wise
-            for dept in sorted(dept_staff.keys()):
+            for dept in self._sorted_depts:
                 # Department label with black background
                 dept_label_frame = ctk.CTkFrame(staff_frame, fg_color="#000000", corner_radius=8)
                 dept_label_frame.pack(fill="x", pady=(10, 5), padx=5)
@@ -738,42 +1102,23 @@ class ExamDutyApp:
                 dept_label = ctk.CTkLabel(
                     dept_label_frame,
                     text=f"{dept} Department",
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                    font=_font(family="Arial", size=14, weight="bold"),
                     text_color="#ffffff"
                 )
                 dept_label.pack(pady=8)
 
-                # Load excluded staff list
-                excluded_staff_file = os.path.join('data', 'excluded_staff.json')
-                excluded_staff = set()
-                if os.path.exists(excluded_staff_file):
-                    try:
-                        with open(excluded_staff_file, 'r') as f:
-                            excluded_staff = set(json.load(f))
-                    except:
-                        excluded_staff = set()
-
                 # Staff list
-                for staff in sorted(dept_staff[dept], key=lambda x: x['staff_name']):
+                for staff in sorted(dept_staff[dept], key=itemgetter('staff_name')):
                     is_excluded = staff['staff_name'].strip() in excluded_staff
                     
-                    # Create combined button configuration
-                    button_config = staff_button_config.copy()  # Create a copy of base config
-                    button_config.update({  # Update with color settings
-                        'fg_color': "#ffffff" if is_excluded else "#000000",
-                        'text_color': "#000000" if is_excluded else "#ffffff",
-                        'hover_color': "#f0f0f0" if is_excluded else "#333333",
-                        'border_color': "#000000",
-                        'border_width': 2
-                    })
-                    
                     staff_btn = ctk.CTkButton(
                         staff_frame,
                         text=f"{staff['staff_name']} ({staff['staff_gender']})",
-                        command=lambda s=staff: self.show_staff_details_right(s, right_panel),
-                        **button_config  # Use single combined configuration
+                        command=partial(self.show_staff_details_right, staff, right_panel),
+                        **(self.STAFF_BUTTON_EXCLUDED if is_excluded else self.STAFF_BUTTON_ACTIVE)
                     )
                     staff_btn.pack(pady=3)
+                    self._staff_buttons[staff['staff_name'].strip()] = staff_btn
 
             # Back button at the bottom
             back_btn = ctk.CTkButton(
@@ -782,7 +1127,7 @@ class ExamDutyApp:
                 command=self.create_home_page,
                 width=200,
                 height=40,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 fg_color="#000000",
                 hover_color="#333333",
                 corner_radius=8
@@ -796,212 +1141,215 @@ class ExamDutyApp:
             messagebox.showerror("Error", f"Error loading staff details: {str(e)}")
             self.create_home_page()
 
-    def show_staff_details_right(self, staff, right_panel):
-        # Clear previous details
-        for widget in right_panel.winfo_children():
-            widget.destroy()
+    def _build_stats_view(self, right_panel):
+        """Build the statistics view skeleton once and return handles to the widgets that change"""
+        view_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
 
-        # Load excluded staff list
-        excluded_staff = set()
-        excluded_staff_file = os.path.join('data', 'excluded_staff.json')
-        if os.path.exists(excluded_staff_file):
-            try:
-                with open(excluded_staff_file, 'r') as f:
-                    excluded_staff = set(json.load(f))
-            except:
-                excluded_staff = set()
+        stats_title = ctk.CTkLabel(
+            view_frame,
+            text="STAFF STATISTICS",
+            font=_font(family="Arial", size=20, weight="bold"),
+            text_color="#000000"
+        )
+        stats_title.pack(pady=20)
 
-        if staff is None:
-            # Show overall statistics
-            stats_title = ctk.CTkLabel(
-                right_panel,
-                text="STAFF STATISTICS",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color="#000000"
+        # Create boxes for total, available, male, and female counts
+        counts_frame = ctk.CTkFrame(view_frame, fg_color="transparent")
+        counts_frame.pack(fill="x", padx=20, pady=10)
+
+        count_labels = {}
+        for key, text in (('total', "Total Staff"), ('available', "Available Staff"),
+                          ('male', "Male Staff Available"), ('female', "Female Staff Available")):
+            box = ctk.CTkFrame(counts_frame, **self.STATS_STYLE)
+            box.pack(fill="x", pady=5)
+
+            ctk.CTkLabel(
+                box,
+                text=text,
+                font=_font(family="Arial", size=14, weight="bold"),
+                text_color=self.UI_THEME['header_fg']
+            ).pack(pady=(8, 0))
+
+            count_labels[key] = ctk.CTkLabel(
+                box,
+                text="",
+                font=_font(family="Arial", size=24, weight="bold"),
+                text_color=self.UI_THEME['header_fg']
             )
-            stats_title.pack(pady=20)
+            count_labels[key].pack(pady=(0, 8))
 
-            try:
-                with open("data/staff.json", 'r') as f:
-                    staff_list = json.load(f)
-            
-                # Calculate statistics
-                total_staff = len(staff_list)
-                available_staff = len([s for s in staff_list if s.get('staff_name', '').strip() not in excluded_staff])
-                female_staff = len([s for s in staff_list if s.get('staff_gender', '').upper() in ['F', 'FEMALE'] 
-                                  and s.get('staff_name', '').strip() not in excluded_staff])
-                male_staff = len([s for s in staff_list if s.get('staff_gender', '').upper() in ['M', 'MALE']
-                                and s.get('staff_name', '').strip() not in excluded_staff])
-
-                # Stats boxes with consistent styling
-                stats_style = {
-                    "fg_color": self.UI_THEME['header_bg'],
-                    "corner_radius": 8,
-                    "border_width": 1,
-                    "border_color": self.UI_THEME['button_border']
-                }
+        # Department-wise counts title
+        dept_title = ctk.CTkLabel(
+            view_frame,
+            text="DEPARTMENT-WISE STAFF COUNT",
+            font=_font(family="Arial", size=20, weight="bold"),
+            text_color="#000000"
+        )
+        dept_title.pack(pady=(20, 10))
 
-                # Create boxes for total, available, male, and female counts
-                counts_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
-                counts_frame.pack(fill="x", padx=20, pady=10)
+        # Create scrollable frame for department counts
+        dept_scroll_container = ctk.CTkFrame(view_frame, fg_color="transparent")
+        dept_scroll_container.pack(fill="both", expand=True, padx=20, pady=10)
+        dept_scroll_container.grid_columnconfigure(0, weight=1)
 
-                # Total Staff Box
-                total_box = ctk.CTkFrame(counts_frame, **stats_style)
-                total_box.pack(fill="x", pady=5)
-                
-                ctk.CTkLabel(
-                    total_box,
-                    text="Total Staff",
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(8, 0))
-                
-                ctk.CTkLabel(
-                    total_box,
-                    text=str(total_staff),
-                    font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(0, 8))
-
-                # Available Staff Box
-                available_box = ctk.CTkFrame(counts_frame, **stats_style)
-                available_box.pack(fill="x", pady=5)
-                
-                ctk.CTkLabel(
-                    available_box,
-                    text="Available Staff",
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(8, 0))
-                
-                ctk.CTkLabel(
-                    available_box,
-                    text=str(available_staff),
-                    font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(0, 8))
-
-                # Male Staff Box
-                male_box = ctk.CTkFrame(counts_frame, **stats_style)
-                male_box.pack(fill="x", pady=5)
-                
-                ctk.CTkLabel(
-                    male_box,
-                    text="Male Staff Available",
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(8, 0))
-                
-                ctk.CTkLabel(
-                    male_box,
-                    text=str(male_staff),
-                    font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(0, 8))
-
-                # Female Staff Box
-                female_box = ctk.CTkFrame(counts_frame, **stats_style)
-                female_box.pack(fill="x", pady=5)
-                
-                ctk.CTkLabel(
-                    female_box,
-                    text="Female Staff Available",
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(8, 0))
-                
-                ctk.CTkLabel(
-                    female_box,
-                    text=str(female_staff),
-                    font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
-                    text_color=self.UI_THEME['header_fg']
-                ).pack(pady=(0, 8))
-
-                # Department-wise counts title
-                dept_title = ctk.CTkLabel(
-                    right_panel,
-                    text="DEPARTMENT-WISE STAFF COUNT",
-                    font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                    text_color="#000000"
-                )
-                dept_title.pack(pady=(20, 10))
+        dept_scroll_frame = ctk.CTkScrollableFrame(
+            dept_scroll_container,
+            fg_color="transparent",
+            orientation="vertical"
+        )
+        dept_scroll_frame.pack(fill="both", expand=True)
+
+        # Configure grid columns for responsive layout
+        dept_scroll_frame.grid_columnconfigure((0, 1), weight=1)  # Two columns
+
+        return {
+            'panel': right_panel,
+            'frame': view_frame,
+            'count_labels': count_labels,
+            'dept_scroll_frame': dept_scroll_frame,
+            'dept_boxes': {},
+            'after_id': None
+        }
 
-                # Create scrollable frame for department counts
-                dept_scroll_container = ctk.CTkFrame(right_panel, fg_color="transparent")
-                dept_scroll_container.pack(fill="both", expand=True, padx=20, pady=10)
-                dept_scroll_container.grid_columnconfigure(0, weight=1)
+    def _update_dept_boxes(self, stats_view, dept_counts):
+        """Add, relabel or remove department boxes so they match dept_counts, creating new boxes in batches"""
+        # Drop any batch still pending from an earlier update
+        if stats_view.get('after_id') is not None:
+            self.app.after_cancel(stats_view['after_id'])
+            stats_view['after_id'] = None
+        if not stats_view['frame'].winfo_exists():
+            return
 
-                dept_scroll_frame = ctk.CTkScrollableFrame(
-                    dept_scroll_container,
-                    fg_color="transparent",
-                    orientation="vertical"
+        dept_boxes = stats_view['dept_boxes']
+
+        # Remove boxes for departments that no longer exist
+        relayout = False
+        for dept in [dept for dept in dept_boxes if dept not in dept_counts]:
+            dept_boxes.pop(dept)[0].destroy()
+            relayout = True
+
+        # Create smaller boxes for each department in a grid, in the pre-sorted order
+        dept_names = [dept for dept in self._sorted_depts if dept in dept_counts]
+        created = 0
+        for dept in dept_names:
+            total, available = dept_counts[dept]
+            text = f"Total: {total}    Available: {available}"
+
+            if dept in dept_boxes:
+                # Only touch the label when the counts changed
+                entry = dept_boxes[dept]
+                if entry[2] != text:
+                    entry[1].configure(text=text)
+                    entry[2] = text
+                continue
+
+            if created == self.DEPT_BATCH_SIZE:
+                # Create the remaining boxes once this batch has been drawn
+                stats_view['after_id'] = self.app.after(
+                    self.BATCH_DELAY_MS, self._update_dept_boxes, stats_view, dept_counts
                 )
-                dept_scroll_frame.pack(fill="both", expand=True)
+                break
+
+            # Department box with reduced size
+            dept_box = ctk.CTkFrame(
+                stats_view['dept_scroll_frame'],
+                **self.STATS_STYLE,
+                width=180  # Fixed width for consistency
+            )
+            dept_box.grid_columnconfigure(0, weight=1)  # Make content center-aligned
 
-                # Configure grid columns for responsive layout
-                dept_scroll_frame.grid_columnconfigure((0, 1), weight=1)  # Two columns
+            # Department name
+            ctk.CTkLabel(
+                dept_box,
+                text=dept,
+                font=_font(family="Arial", size=12, weight="bold"),
+                text_color=self.UI_THEME['header_fg']
+            ).pack(pady=(8, 0))
+
+            # Total and available counts
+            counts_label = ctk.CTkLabel(
+                dept_box,
+                text=text,
+                font=_font(family="Arial", size=12),
+                text_color=self.UI_THEME['header_fg']
+            )
+            counts_label.pack(padx=5, pady=(0, 8))
+
+            dept_boxes[dept] = [dept_box, counts_label, text]
+            created += 1
+            relayout = True
+
+        # Grid positions only shift when departments were added or removed
+        if relayout:
+            for idx, dept in enumerate(dept_names):
+                if dept not in dept_boxes:
+                    break
+                dept_boxes[dept][0].grid(row=idx // 2, column=idx % 2, padx=5, pady=5, sticky="ew")  # Two columns
+
+    def show_staff_details_right(self, staff, right_panel):
+        # Keep the statistics view if it was built for this panel, clear everything else
+        stats_view = self._stats_view
+        if stats_view is not None and stats_view['panel'] is not right_panel:
+            stats_view = None
+        for widget in right_panel.winfo_children():
+            if stats_view is not None and widget is stats_view['frame']:
+                widget.pack_forget()
+            else:
+                widget.destroy()
 
-                # Calculate department-wise counts
+        # Load excluded staff list
+        excluded_staff = self._get_excluded_staff()
+
+        if staff is None:
+            # Show overall statistics
+            try:
+                staff_list = self._get_staff_list()
+            
+                # Calculate statistics and department-wise counts in a single pass
+                total_staff = len(staff_list)
+                available_staff = female_staff = male_staff = 0
                 dept_counts = {}
-                for s in staff_list:
-                    dept = s.get('staff_dept', '').strip()
-                    if dept:
-                        if dept not in dept_counts:
-                            dept_counts[dept] = {
-                                'total': 0,
-                                'available': 0
-                            }
-                        dept_counts[dept]['total'] += 1
-                        if s.get('staff_name', '').strip() not in excluded_staff:
-                            dept_counts[dept]['available'] += 1
-
-                # Create smaller boxes for each department in a grid
-                for idx, dept in enumerate(sorted(dept_counts.keys())):
-                    row = idx // 2  # Two columns
-                    col = idx % 2
-                    
-                    # Department box with reduced size
-                    dept_box = ctk.CTkFrame(
-                        dept_scroll_frame,
-                        **stats_style,
-                        width=180  # Fixed width for consistency
-                    )
-                    dept_box.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
-                    dept_box.grid_columnconfigure(0, weight=1)  # Make content center-aligned
-                    
-                    # Department name
-                    ctk.CTkLabel(
-                        dept_box,
-                        text=dept,
-                        font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                        text_color=self.UI_THEME['header_fg']
-                    ).pack(pady=(8, 0))
-                    
-                    # Counts frame
-                    counts_frame = ctk.CTkFrame(dept_box, fg_color="transparent")
-                    counts_frame.pack(pady=(0, 8))
-                    
-                    # Total count
-                    ctk.CTkLabel(
-                        counts_frame,
-                        text=f"Total: {dept_counts[dept]['total']}",
-                        font=ctk.CTkFont(family="Arial", size=12),
-                        text_color=self.UI_THEME['header_fg']
-                    ).pack(side="left", padx=5)
-                    
-                    # Available count
-                    ctk.CTkLabel(
-                        counts_frame,
-                        text=f"Available: {dept_counts[dept]['available']}",
-                        font=ctk.CTkFont(family="Arial", size=12),
-                        text_color=self.UI_THEME['header_fg']
-                    ).pack(side="left", padx=5)
+                if not excluded_staff:
+                    # Nobody is excluded, so skip the membership test entirely
+                    available_staff = total_staff
+                    for name, gender, dept in staff_list:
+                        female_staff += gender == 'F'
+                        male_staff += gender == 'M'
+                        if dept:
+                            counts = dept_counts.setdefault(dept, [0, 0])  # [total, available]
+                            counts[0] += 1
+                            counts[1] += 1
+                else:
+                    for name, gender, dept in staff_list:
+                        # Booleans add as 0/1, so each counter is a single addition
+                        is_available = name not in excluded_staff
+                        available_staff += is_available
+                        female_staff += is_available and gender == 'F'
+                        male_staff += is_available and gender == 'M'
+                        if dept:
+                            counts = dept_counts.setdefault(dept, [0, 0])  # [total, available]
+                            counts[0] += 1
+                            counts[1] += is_available
+
+                # Build the view on first use, then only update the changing labels
+                if stats_view is None:
+                    stats_view = self._build_stats_view(right_panel)
+                    self._stats_view = stats_view
+                stats_view['frame'].pack(fill="both", expand=True, padx=5, pady=5)
+
+                count_labels = stats_view['count_labels']
+                count_labels['total'].configure(text=str(total_staff))
+                count_labels['available'].configure(text=str(available_staff))
+                count_labels['male'].configure(text=str(male_staff))
+                count_labels['female'].configure(text=str(female_staff))
+
+                self._update_dept_boxes(stats_view, dept_counts)
 
             except Exception as e:
                 error_label = ctk.CTkLabel(
                     right_panel,
                     text=f"Error loading statistics: {str(e)}",
-                    font=ctk.CTkFont(size=14),
+                    font=_font(size=14),
                     text_color="#000000"
                 )
                 error_label.pack(pady=20)
@@ -1011,7 +1359,7 @@ class ExamDutyApp:
             details_title = ctk.CTkLabel(
                 right_panel,
                 text="STAFF DETAILS",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
+                font=_font(family="Arial", size=20, weight="bold"),
                 text_color="#000000"
             )
             details_title.pack(pady=20)
@@ -1040,14 +1388,14 @@ class ExamDutyApp:
                 ctk.CTkLabel(
                     detail_box,
                     text=label.upper(),
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                    font=_font(family="Arial", size=14, weight="bold"),
                     text_color="#ffffff"
                 ).pack(pady=(10, 0))
                 
                 ctk.CTkLabel(
                     detail_box,
                     text=str(value),
-                    font=ctk.CTkFont(family="Arial", size=16),
+                    font=_font(family="Arial", size=16),
                     text_color="#ffffff"
                 ).pack(pady=(0, 10))
 
@@ -1067,7 +1415,7 @@ class ExamDutyApp:
                 details_frame,
                 text=button_text,
                 command=lambda: self.toggle_staff_allotment(staff_name, right_panel),
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 width=200,
                 height=40,
                 corner_radius=8,
@@ -1081,35 +1429,39 @@ class ExamDutyApp:
         excluded_staff_file = os.path.join('data', 'excluded_staff.json')
         
         # Load current excluded staff
-        excluded_staff = []
-        if os.path.exists(excluded_staff_file):
-            try:
-                with open(excluded_staff_file, 'r') as f:
-                    excluded_staff = json.load(f)
-            except:
-                excluded_staff = []
+        excluded_staff = set(self._get_excluded_staff())
         
         # Toggle staff status
         if staff_name in excluded_staff:
             excluded_staff.remove(staff_name)
             message = f"{staff_name} has been restored for allotment"
         else:
-            excluded_staff.append(staff_name)
+            excluded_staff.add(staff_name)
             message = f"{staff_name} has been removed from allotment"
         
         # Save updated list
-        with open(excluded_staff_file, 'w') as f:
-            json.dump(excluded_staff, f)
+        _write_atomic(excluded_staff_file, _json_dumps(sorted(excluded_staff), compact=True))
         
-        # Refresh the display
-        self.show_staff_details()
+        # Update the cache directly instead of re-reading the file
+        self._excluded_staff = frozenset(excluded_staff)
+        self._excluded_mtime = os.stat(excluded_staff_file).st_mtime_ns
+        
+        # Recolor only the toggled staff button and refresh the statistics panel
+        staff_btn = self._staff_buttons.get(staff_name)
+        if staff_btn is not None:
+            style = self.STAFF_BUTTON_EXCLUDED if staff_name in excluded_staff else self.STAFF_BUTTON_ACTIVE
+            staff_btn.configure(
+                fg_color=style['fg_color'],
+                text_color=style['text_color'],
+                hover_color=style['hover_color']
+            )
+        self.show_staff_details_right(None, right_panel)
         messagebox.showinfo("Success", message)
 
     def select_dates(self):
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
 
             # Create main container with responsive padding
             main_container = ctk.CTkFrame(self.app, fg_color="transparent")
@@ -1137,7 +1489,7 @@ class ExamDutyApp:
             calendar_title = ctk.CTkLabel(
                 content_frame,
                 text="SELECT DATE RANGE",
-                font=ctk.CTkFont(family="Arial", size=title_size, weight="bold"),
+                font=_font(family="Arial", size=title_size, weight="bold"),
                 text_color=self.UI_THEME['button_fg']
             )
             calendar_title.pack(pady=(20, 10))
@@ -1166,7 +1518,7 @@ class ExamDutyApp:
             start_date_label = ctk.CTkLabel(
                 start_date_frame, 
                 text="Start Date",
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 text_color=self.UI_THEME['button_fg']
             )
             start_date_label.pack(pady=(10, 5))
@@ -1195,7 +1547,7 @@ class ExamDutyApp:
             end_date_label = ctk.CTkLabel(
                 end_date_frame, 
                 text="End Date",
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 text_color=self.UI_THEME['button_fg']
             )
             end_date_label.pack(pady=(10, 5))
@@ -1219,7 +1571,7 @@ class ExamDutyApp:
                 command=lambda: generate_dates(),
                 width=button_width,
                 height=button_height,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 fg_color=self.UI_THEME['button_bg'],
                 text_color=self.UI_THEME['button_fg'],
                 hover_color=self.UI_THEME['button_hover'],
@@ -1233,7 +1585,7 @@ class ExamDutyApp:
             dates_title = ctk.CTkLabel(
                 content_frame,
                 text="SELECTED DATES",
-                font=ctk.CTkFont(family="Arial", size=title_size, weight="bold"),
+                font=_font(family="Arial", size=title_size, weight="bold"),
                 text_color=self.UI_THEME['button_fg']
             )
             dates_title.pack(pady=(20, 10))
@@ -1258,25 +1610,29 @@ class ExamDutyApp:
 
             def generate_dates():
                 try:
-                    start_date = datetime.strptime(start_cal.get_date().strftime("%Y-%m-%d"), "%Y-%m-%d")
-                    end_date = datetime.strptime(end_cal.get_date().strftime("%Y-%m-%d"), "%Y-%m-%d")
+                    start_date = start_cal.get_date()
+                    end_date = end_cal.get_date()
 
                     if start_date > end_date:
                         messagebox.showerror("Error", "Start date cannot be after end date")
                         return
 
-                    # Clear existing dates
-                    self.selected_dates = []
-                    for widget in dates_scroll_frame.winfo_children():
-                        widget.destroy()
-
-                    # Generate dates excluding Sundays
-                    current_date = start_date
-                    while current_date <= end_date:
-                        if current_date.weekday() != 6:  # 6 represents Sunday
-                            date_str = current_date.strftime("%Y-%m-%d")
-                            self.selected_dates.append(date_str)
-                            
+                    # Detach the list while rows are rebuilt so Tk lays it out once at the end
+                    dates_scroll_frame.pack_forget()
+                    try:
+                        # Clear existing dates
+                        for widget in dates_scroll_frame.winfo_children():
+                            widget.destroy()
+
+                        # Generate dates excluding Sundays (ordinals divisible by 7 are Sundays)
+                        days = [
+                            date.fromordinal(o)
+                            for o in range(start_date.toordinal(), end_date.toordinal() + 1)
+                            if o % 7 != 0
+                        ]
+                        self.selected_dates = dict.fromkeys(day.strftime("%Y-%m-%d") for day in days)
+
+                        for day, date_str in zip(days, list(self.selected_dates)):
                             # Create frame for date with enhanced styling
                             date_frame = ctk.CTkFrame(
                                 dates_scroll_frame,
@@ -1287,32 +1643,32 @@ class ExamDutyApp:
                             )
                             date_frame.pack(fill="x", padx=10, pady=5)
                             date_frame.grid_columnconfigure(0, weight=1)
-                            
+                        
                             # Format date for display
-                            formatted_date = current_date.strftime("%d %B %Y (%A)")
-                            
+                            formatted_date = day.strftime("%d %B %Y (%A)")
+                        
                             # Date container frame for better alignment
                             date_container = ctk.CTkFrame(date_frame, fg_color="transparent")
                             date_container.pack(fill="x", padx=10, pady=8)
                             date_container.grid_columnconfigure(0, weight=1)
-                            
+                        
                             # Date label with enhanced styling
                             date_label = ctk.CTkLabel(
                                 date_container, 
                                                   text=formatted_date,
-                                font=ctk.CTkFont(family="Arial", size=14),
+                                font=_font(family="Arial", size=14),
                                 text_color=self.UI_THEME['button_fg']
                             )
                             date_label.pack(side="left")
-                            
+                        
                             # Remove button with theme-consistent styling
                             remove_btn = ctk.CTkButton(
                                 date_container,
                                 text="✕",  # Using × symbol instead of text
                                                    width=30,
                                 height=30,
-                                command=lambda d=date_str, f=date_frame: remove_date(d, f),
-                                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                                command=partial(remove_date, date_str),
+                                font=_font(family="Arial", size=14, weight="bold"),
                                 fg_color=self.UI_THEME['button_bg'],
                                 text_color=self.UI_THEME['button_fg'],
                                 hover_color=self.UI_THEME['button_hover'],
@@ -1321,8 +1677,9 @@ class ExamDutyApp:
                                 corner_radius=8
                             )
                             remove_btn.pack(side="right")
-                            
-                        current_date += timedelta(days=1)
+                            self.selected_dates[date_str] = date_frame
+                    finally:
+                        dates_scroll_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
                     # Update the dates display frame appearance
                     if self.selected_dates:
@@ -1338,9 +1695,9 @@ class ExamDutyApp:
                 except Exception as e:
                     messagebox.showerror("Error", f"Error generating dates: {str(e)}")
 
-            def remove_date(date_str, date_frame):
-                if date_str in self.selected_dates:
-                    self.selected_dates.remove(date_str)
+            def remove_date(date_str):
+                date_frame = self.selected_dates.pop(date_str, None)
+                if date_frame is not None:
                     date_frame.destroy()
 
             def proceed_to_configure():
@@ -1361,7 +1718,7 @@ class ExamDutyApp:
                 command=self.create_home_page,
                 width=button_width,
                 height=button_height,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 fg_color=self.UI_THEME['button_bg'],
                 text_color=self.UI_THEME['button_fg'],
                 hover_color=self.UI_THEME['button_hover'],
@@ -1378,7 +1735,7 @@ class ExamDutyApp:
                 command=lambda: proceed_to_configure(),
                 width=button_width,
                 height=button_height,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 fg_color=self.UI_THEME['button_bg'],
                 text_color=self.UI_THEME['button_fg'],
                 hover_color=self.UI_THEME['button_hover'],
@@ -1400,19 +1757,18 @@ class ExamDutyApp:
                 return
 
             # Save selected dates to settings
-            with open(DB_FILES['settings'], 'w') as f:
-                json.dump({
-                    'dates': self.selected_dates,
-                    'reporting_time': '',
-                    'assessment_name': '',
-                    'exam_time': '',
-                    'exam_details': ''
-                }, f)
+            _write_atomic(DB_FILES['settings'], _json_dumps({
+                'dates': list(self.selected_dates),
+                'reporting_time': '',
+                'assessment_name': '',
+                'exam_time': '',
+                'exam_details': ''
+            }, compact=True))
 
             # Load configurations only for selected dates
             self.config_manager.clear_configurations()
-            for date in self.selected_dates:
-                self.config_manager.set_date_config(date, {
+            self.config_manager.set_many({
+                date: {
                     'rooms': [],
                     'settings': {
                         'reporting_time': '',
@@ -1420,7 +1776,9 @@ class ExamDutyApp:
                         'exam_time': '',
                         'exam_details': ''
                     }
-                })
+                }
+                for date in self.selected_dates
+            })
 
             self.configure_selected_classes()
         except Exception as e:
@@ -1430,21 +1788,22 @@ class ExamDutyApp:
     def configure_selected_classes(self):
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
 
             # Initialize class variables
-            self.building_vars = {}
-            self.class_vars = {}
             self.class_modifiers = {}
 
             # Load halls data from halls.json instead of using self.buildings
             try:
-                with open(DB_FILES['halls'], 'r') as f:
-                    self.buildings = json.load(f)  # Replace self.buildings with data from halls.json
+                self._wait_preload('halls')
+                self._wait_preload('staff')
+                self.set_buildings(self._load_json(DB_FILES['halls']))  # Replace self.buildings with data from halls.json
             except Exception as e:
                 print(f"Error loading halls data: {str(e)}")
-                self.buildings = {}
+                self.set_buildings({})
+
+            # Selection variables for every building and class, kept across visits
+            self._ensure_vars()
 
             # Calculate staff statistics
             total_staff = 0
@@ -1452,244 +1811,141 @@ class ExamDutyApp:
             female_staff = 0
             male_staff = 0
 
-            # Load staff data and excluded staff
+            # Load staff counts from the shared staff index
             try:
-                with open("data/staff.json", 'r') as f:
-                    staff_list = json.load(f)
-                
-                excluded_staff_file = os.path.join('data', 'excluded_staff.json')
-                excluded_staff = set()
-                if os.path.exists(excluded_staff_file):
-                    with open(excluded_staff_file, 'r') as f:
-                        excluded_staff = set(json.load(f))
-
-                # Calculate statistics
-                total_staff = len(staff_list)
-                available_staff = len([s for s in staff_list if s.get('staff_name', '').strip() not in excluded_staff])
-                female_staff = len([s for s in staff_list if s.get('staff_gender', '').upper() in ['F', 'FEMALE'] 
-                                  and s.get('staff_name', '').strip() not in excluded_staff])
-                male_staff = len([s for s in staff_list if s.get('staff_gender', '').upper() in ['M', 'MALE']
-                                and s.get('staff_name', '').strip() not in excluded_staff])
+                staff_index = self._get_staff_index()
+                total_staff = staff_index.total
+                available_staff = staff_index.available
+                female_staff = staff_index.female
+                male_staff = staff_index.male
             except Exception as e:
                 print(f"Error loading staff data: {str(e)}")
 
-            # Create main container
-            main_container = ctk.CTkFrame(self.app, fg_color="transparent")
-            main_container.pack(fill="both", expand=True, padx=40, pady=30)
+            # Number of checked classes per building, kept in step with the checkboxes
+            self._checked_count_by_building = {
+                building_name: sum(self.class_vars[c].get() for c in classes)
+                for building_name, classes in self.buildings.items()
+            }
 
-            # Add header
-            self.create_header(main_container, "CONFIGURE CLASSES")
+            # Reuse the page shell and statistics panel from an earlier visit
+            main_container = self._pages.get('configure')
+            if main_container is not None:
+                main_container.pack(fill="both", expand=True, padx=40, pady=30)
 
-            # Content frame with border
-            content_frame = ctk.CTkFrame(
-                main_container,
-                fg_color=self.UI_THEME['content_bg'],
-                corner_radius=15,
-                border_width=2,
-                border_color=self.UI_THEME['button_border']
-            )
-            content_frame.pack(fill="both", expand=True, padx=20)
+                # Class modifiers start empty, so nothing is required yet
+                for label in (self.required_total_label, self.required_female_label, self.required_male_label):
+                    label.configure(text="0")
 
-            # Create split container
-            split_container = ctk.CTkFrame(content_frame, fg_color="transparent")
-            split_container.pack(fill="both", expand=True, padx=20, pady=20)
-            split_container.grid_columnconfigure(1, weight=3)  # Right panel takes more space
-            split_container.grid_rowconfigure(0, weight=1)
-
-            # Helper functions for updating UI
-            def update_classes(building_name):
-                # When building checkbox is clicked, update all its classes
-                building_state = self.building_vars[building_name].get()
-                for class_name in self.buildings[building_name]:
-                    self.class_vars[class_name].set(building_state)
-
-            def update_building(building_name):
-                # When class checkbox is clicked, check if all classes are checked
-                all_checked = all(self.class_vars[c].get() 
-                                for c in self.buildings[building_name])
-                self.building_vars[building_name].set(all_checked)
-
-            # Left panel for statistics
-            left_panel = ctk.CTkFrame(
-                split_container,
-                fg_color=self.UI_THEME['content_bg'],
-                corner_radius=10,
-                border_width=1,
-                border_color=self.UI_THEME['button_border']
-            )
-            left_panel.grid(row=0, column=0, sticky="nsew", padx=(0, 10), pady=10)
-
-            # Available Staff Section
-            staff_title = ctk.CTkLabel(
-                left_panel,
-                text="AVAILABLE STAFF",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
-                text_color=self.UI_THEME['button_fg']
-            )
-            staff_title.pack(pady=(15, 10))
-
-            # Create grid frame for available staff stats
-            avail_stats_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
-            avail_stats_frame.pack(fill="x", padx=10, pady=5)
-            avail_stats_frame.grid_columnconfigure((0, 1), weight=1)
-
-            # Stats style
-            stats_style = {
-                "fg_color": self.UI_THEME['header_bg'],
-                "corner_radius": 8,
-                "border_width": 1,
-                "border_color": self.UI_THEME['button_border'],
-                "width": 120,
-                "height": 80
-            }
-
-            # Available Staff Box
-            available_box = ctk.CTkFrame(avail_stats_frame, **stats_style)
-            available_box.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
-            
-            ctk.CTkLabel(
-                available_box,
-                text="Total",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
-            
-            ctk.CTkLabel(
-                available_box,
-                text=str(available_staff),
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(0, 5))
-
-            # Female Staff Box
-            female_box = ctk.CTkFrame(avail_stats_frame, **stats_style)
-            female_box.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
-            
-            ctk.CTkLabel(
-                female_box,
-                text="Female",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
-            
-            ctk.CTkLabel(
-                female_box,
-                text=str(female_staff),
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(0, 5))
-
-            # Male Staff Box
-            male_box = ctk.CTkFrame(avail_stats_frame, **stats_style)
-            male_box.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
-            
-            ctk.CTkLabel(
-                male_box,
-                text="Male",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
-            
-            ctk.CTkLabel(
-                male_box,
-                text=str(male_staff),
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(0, 5))
-
-            # Required Staff Section with separator
-            separator = ctk.CTkFrame(
-                left_panel,
-                height=2,
-                fg_color=self.UI_THEME['button_border']
-            )
-            separator.pack(fill="x", padx=20, pady=15)
+                # The right panel is rebuilt for the new selection, including any settings view
+                for widget in self.right_panel.winfo_children():
+                    widget.destroy()
+                self._class_config_view = None
+            else:
+                # Create main container
+                main_container = ctk.CTkFrame(self.app, fg_color="transparent")
+                main_container.pack(fill="both", expand=True, padx=40, pady=30)
+                self._pages['configure'] = main_container
 
-            required_title = ctk.CTkLabel(
-                left_panel,
-                text="REQUIRED STAFF",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
-                text_color=self.UI_THEME['button_fg']
-            )
-            required_title.pack(pady=(10, 10))
+                # Add header
+                self.create_header(main_container, "CONFIGURE CLASSES")
 
-            # Create grid frame for required staff stats
-            req_stats_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
-            req_stats_frame.pack(fill="x", padx=10, pady=5)
-            req_stats_frame.grid_columnconfigure((0, 1), weight=1)
+                # Content frame with border
+                content_frame = ctk.CTkFrame(
+                    main_container,
+                    fg_color=self.UI_THEME['content_bg'],
+                    corner_radius=15,
+                    border_width=2,
+                    border_color=self.UI_THEME['button_border']
+                )
+                content_frame.pack(fill="both", expand=True, padx=20)
 
-            # Required Total Box
-            required_box = ctk.CTkFrame(req_stats_frame, **stats_style)
-            required_box.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+                # Create split container
+                split_container = ctk.CTkFrame(content_frame, fg_color="transparent")
+                split_container.pack(fill="both", expand=True, padx=20, pady=20)
+                split_container.grid_columnconfigure(1, weight=3)  # Right panel takes more space
+                split_container.grid_rowconfigure(0, weight=1)
 
-            ctk.CTkLabel(
-                required_box,
-                text="Total",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
+                # Left panel for statistics
+                left_panel = ctk.CTkFrame(
+                    split_container,
+                    fg_color=self.UI_THEME['content_bg'],
+                    corner_radius=10,
+                    border_width=1,
+                    border_color=self.UI_THEME['button_border']
+                )
+                left_panel.grid(row=0, column=0, sticky="nsew", padx=(0, 10), pady=10)
 
-            self.required_total_label = ctk.CTkLabel(
-                required_box,
-                text="0",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            )
-            self.required_total_label.pack(pady=(0, 5))
+                # Available Staff Section
+                staff_title = ctk.CTkLabel(
+                    left_panel,
+                    text="AVAILABLE STAFF",
+                    font=_font(family="Arial", size=16, weight="bold"),
+                    text_color=self.UI_THEME['button_fg']
+                )
+                staff_title.pack(pady=(15, 10))
+
+                # Create grid frame for available staff stats
+                avail_stats_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
+                avail_stats_frame.pack(fill="x", padx=10, pady=5)
+                avail_stats_frame.grid_columnconfigure((0, 1), weight=1)
+
+                # Available staff boxes, filled in below
+                self._available_labels = (
+                    self._make_stat_box(avail_stats_frame, 0, 0, "Total", ""),
+                    self._make_stat_box(avail_stats_frame, 0, 1, "Female", ""),
+                    self._make_stat_box(avail_stats_frame, 1, 0, "Male", "")
+                )
+                self._configure_stats = None
 
-            # Female Required Box
-            female_req_box = ctk.CTkFrame(req_stats_frame, **stats_style)
-            female_req_box.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+                # Required Staff Section with separator
+                separator = ctk.CTkFrame(
+                    left_panel,
+                    height=2,
+                    fg_color=self.UI_THEME['button_border']
+                )
+                separator.pack(fill="x", padx=20, pady=15)
 
-            ctk.CTkLabel(
-                female_req_box,
-                text="Female",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
+                required_title = ctk.CTkLabel(
+                    left_panel,
+                    text="REQUIRED STAFF",
+                    font=_font(family="Arial", size=16, weight="bold"),
+                    text_color=self.UI_THEME['button_fg']
+                )
+                required_title.pack(pady=(10, 10))
 
-            self.required_female_label = ctk.CTkLabel(
-                female_req_box,
-                text="0",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            )
-            self.required_female_label.pack(pady=(0, 5))
+                # Create grid frame for required staff stats
+                req_stats_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
+                req_stats_frame.pack(fill="x", padx=10, pady=5)
+                req_stats_frame.grid_columnconfigure((0, 1), weight=1)
 
-            # Male Possible Box
-            male_req_box = ctk.CTkFrame(req_stats_frame, **stats_style)
-            male_req_box.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+                # Required staff boxes, updated as classes are configured
+                self.required_total_label = self._make_stat_box(req_stats_frame, 0, 0, "Total")
+                self.required_female_label = self._make_stat_box(req_stats_frame, 0, 1, "Female")
+                self.required_male_label = self._make_stat_box(req_stats_frame, 1, 0, "Male")
 
-            ctk.CTkLabel(
-                male_req_box,
-                text="Male",
-                font=ctk.CTkFont(family="Arial", size=12, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            ).pack(pady=(5, 0))
+                # Right panel for class selection and configuration
+                self.right_panel = ctk.CTkFrame(  # Store as class attribute
+                    split_container,
+                    fg_color=self.UI_THEME['content_bg'],
+                    corner_radius=10,
+                    border_width=1,
+                    border_color=self.UI_THEME['button_border']
+                )
+                self.right_panel.grid(row=0, column=1, sticky="nsew", padx=(10, 0), pady=10)
 
-            self.required_male_label = ctk.CTkLabel(
-                male_req_box,
-                text="0",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color=self.UI_THEME['header_fg']
-            )
-            self.required_male_label.pack(pady=(0, 5))
+            # Only touch the available staff labels when the counts have changed
+            stats = (available_staff, female_staff, male_staff)
+            if stats != self._configure_stats:
+                for label, value in zip(self._available_labels, stats):
+                    label.configure(text=str(value))
+                self._configure_stats = stats
 
-            # Right panel for class selection and configuration
-            self.right_panel = ctk.CTkFrame(  # Store as class attribute
-                split_container,
-                fg_color=self.UI_THEME['content_bg'],
-                corner_radius=10,
-                border_width=1,
-                border_color=self.UI_THEME['button_border']
-            )
-            self.right_panel.grid(row=0, column=1, sticky="nsew", padx=(10, 0), pady=10)
 
                 # Title for class selection
             class_title = ctk.CTkLabel(
                 self.right_panel,  # Use self.right_panel
                     text="SELECT CLASSES",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
+                font=_font(family="Arial", size=16, weight="bold"),
                     text_color=self.UI_THEME['button_fg']
                 )
             class_title.pack(pady=(15, 10))
@@ -1701,18 +1957,10 @@ class ExamDutyApp:
             )
             scroll_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
-            # Style for building frames
-            building_style = {
-                "fg_color": self.UI_THEME['header_bg'],
-                "corner_radius": 8,
-                "border_width": 1,
-                "border_color": self.UI_THEME['button_border']
-            }
-
             # Add buildings and their classes
-            for building_name in sorted(self.buildings.keys()):
-                # Building frame
-                building_frame = ctk.CTkFrame(scroll_frame, **building_style)
+            def build_building(building_name):
+                # Building frame, styled like the statistics boxes
+                building_frame = ctk.CTkFrame(scroll_frame, **self.STATS_STYLE)
                 building_frame.pack(fill="x", pady=5)
                 
                 # Building header frame
@@ -1724,26 +1972,14 @@ class ExamDutyApp:
                 header_frame.pack(fill="x", padx=10, pady=5)
                 
                 # Building checkbox
-                building_var = tk.BooleanVar()
-                self.building_vars[building_name] = building_var
-                
-                # Building checkbox style
-                building_checkbox_style = {
-                    "font": ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    "text_color": "#ffffff",  # White text for building name
-                    "fg_color": "#ffffff",    # White when checked
-                    "hover_color": "#cccccc", # Light gray on hover
-                    "border_color": "#ffffff", # White border
-                    "border_width": 2,
-                    "checkmark_color": "#000000"  # Black checkmark for contrast
-                }
+                building_var = self.building_vars[building_name]
                 
                 building_cb = ctk.CTkCheckBox(
                     header_frame,
                                              text=building_name,
                     variable=building_var,
-                                             command=lambda b=building_name: update_classes(b),
-                    **building_checkbox_style
+                                             command=partial(self._on_building_toggle, building_name),
+                    **self.BUILDING_CHECKBOX_STYLE
                     )
                 building_cb.pack(side="left", padx=10, pady=8)
 
@@ -1755,7 +1991,7 @@ class ExamDutyApp:
                 classes_frame.grid_columnconfigure((0, 1, 2), weight=1)
                 
                 # Add classes in a grid
-                for i, class_name in enumerate(sorted(self.buildings[building_name])):
+                for i, class_name in enumerate(self._sorted_classes_by_building[building_name]):
                     row = i // 3
                     col = i % 3
                     
@@ -1770,29 +2006,29 @@ class ExamDutyApp:
                     class_frame.grid(row=row, column=col, padx=5, pady=3, sticky="ew")
                     
                     # Class checkbox
-                    class_var = tk.BooleanVar()
-                    self.class_vars[class_name] = class_var
+                    class_var = self.class_vars[class_name]
                     
-                    # Class checkbox style
-                    class_checkbox_style = {
-                        "font": ctk.CTkFont(family="Arial", size=12),
-                        "text_color": self.UI_THEME['button_fg'],
-                        "fg_color": "#000000",  # Color when checked
-                        "hover_color": "#333333",  # Slightly lighter black on hover
-                        "border_color": self.UI_THEME['button_border'],
-                        "border_width": 2,
-                        "checkmark_color": "#ffffff"  # White checkmark
-                    }
-                        
                     class_cb = ctk.CTkCheckBox(
                         class_frame,
                                               text=class_name,
                         variable=class_var,
-                            command=lambda b=building_name: update_building(b),
-                        **class_checkbox_style
+                            command=partial(self._on_class_toggle, building_name, class_name),
+                        **self.CLASS_CHECKBOX_STYLE
                     )
                     class_cb.pack(padx=8, pady=5)
 
+            def build_buildings(start):
+                # Stop if the page was left before all batches were built
+                if not scroll_frame.winfo_exists():
+                    return
+                end = start + self.BUILDING_BATCH_SIZE
+                for building_name in self._sorted_buildings[start:end]:
+                    build_building(building_name)
+                if end < len(self._sorted_buildings):
+                    self.app.after(self.BATCH_DELAY_MS, build_buildings, end)
+
+            build_buildings(0)
+
             # Button frame at bottom
             button_frame = ctk.CTkFrame(self.right_panel, fg_color="transparent")
             button_frame.pack(fill="x", padx=10, pady=10)
@@ -1803,7 +2039,7 @@ class ExamDutyApp:
                 button_frame,
                 text="← Back",
                 command=self.create_home_page,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 width=120,
                 height=35,
                 fg_color=self.UI_THEME['button_bg'],
@@ -1820,7 +2056,7 @@ class ExamDutyApp:
                 button_frame,
                 text="Next →",
                 command=lambda: self.show_class_configuration(),  # Changed from configure_selected_rooms
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                font=_font(family="Arial", size=14, weight="bold"),
                 width=120,
                 height=35,
                 fg_color=self.UI_THEME['button_bg'],
@@ -1837,6 +2073,162 @@ class ExamDutyApp:
             print(f"Error details: {traceback.format_exc()}")
             messagebox.showerror("Error", f"Error in class configuration: {str(e)}")
 
+    def _on_building_toggle(self, building_name):
+        """Check or uncheck every class of a building to match its checkbox"""
+        building_state = self.building_vars[building_name].get()
+        for class_name in self.buildings[building_name]:
+            # Only touch classes whose state actually changes, each set redraws its checkbox
+            class_var = self.class_vars[class_name]
+            if class_var.get() != building_state:
+                class_var.set(building_state)
+        self._checked_count_by_building[building_name] = len(self.buildings[building_name]) if building_state else 0
+
+    def _on_class_toggle(self, building_name, class_name):
+        """Tick a building's checkbox only when all of its classes are checked"""
+        self._checked_count_by_building[building_name] += 1 if self.class_vars[class_name].get() else -1
+        all_checked = self._checked_count_by_building[building_name] == len(self.buildings[building_name])
+        self.building_vars[building_name].set(all_checked)
+
+    def _make_stat_box(self, parent, row, col, title, value=0):
+        """Create a small statistics box in a grid cell and return its value label"""
+        box = ctk.CTkFrame(parent, **self.STAT_BOX_STYLE)
+        box.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
+
+        ctk.CTkLabel(
+            box,
+            text=title,
+            font=_font(family="Arial", size=12, weight="bold"),
+            text_color=self.UI_THEME['header_fg']
+        ).pack(pady=(5, 0))
+
+        value_label = ctk.CTkLabel(
+            box,
+            text=str(value),
+            font=_font(family="Arial", size=20, weight="bold"),
+            text_color=self.UI_THEME['header_fg']
+        )
+        value_label.pack(pady=(0, 5))
+        return value_label
+
+    def _build_class_config_view(self):
+        """Build the title, scroll area and buttons of the class settings view"""
+        # Title for configuration
+        class_title = ctk.CTkLabel(
+            self.right_panel,
+            text="CONFIGURE CLASS SETTINGS",
+            font=_font(family="Arial", size=16, weight="bold"),
+            text_color=self.UI_THEME['button_fg']
+        )
+        class_title.pack(pady=(15, 10))
+
+        # Create scrollable frame for class configurations
+        scroll_frame = ctk.CTkScrollableFrame(
+            self.right_panel,
+            fg_color="transparent"
+        )
+        scroll_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        # Button frame
+        button_frame = ctk.CTkFrame(self.right_panel, fg_color="transparent")
+        button_frame.pack(fill="x", padx=10, pady=10)
+        button_frame.grid_columnconfigure((0, 1), weight=1)
+
+        # Back button
+        back_btn = ctk.CTkButton(
+            button_frame,
+            text="← Back",
+            command=self.create_home_page,
+            font=_font(family="Arial", size=14, weight="bold"),
+            width=150,
+            height=35,
+            fg_color=self.UI_THEME['button_bg'],
+            text_color=self.UI_THEME['button_fg'],
+            hover_color=self.UI_THEME['button_hover'],
+            border_color=self.UI_THEME['button_border'],
+            border_width=2,
+            corner_radius=8
+        )
+        back_btn.pack(side="left", padx=5)
+
+        # Save Configuration button
+        save_btn = ctk.CTkButton(
+            button_frame,
+            text="Save Configuration →",
+            command=self.save_configuration,
+            font=_font(family="Arial", size=14, weight="bold"),
+            width=150,
+            height=35,
+            fg_color=self.UI_THEME['button_bg'],
+            text_color=self.UI_THEME['button_fg'],
+            hover_color=self.UI_THEME['button_hover'],
+            border_color=self.UI_THEME['button_border'],
+            border_width=2,
+            corner_radius=8
+        )
+        save_btn.pack(side="right", padx=5)
+
+        return {
+            'panel': self.right_panel,
+            'buildings': self.buildings,
+            'widgets': (class_title, scroll_frame, button_frame),
+            'scroll_frame': scroll_frame,
+            'rows': {}
+        }
+
+    def _build_class_config_row(self, scroll_frame, class_name):
+        """Create the settings row for one class"""
+        # Create frame for this class
+        class_frame = ctk.CTkFrame(
+            scroll_frame,
+            fg_color=self.UI_THEME['content_bg'],
+            corner_radius=8,
+            border_width=1,
+            border_color=self.UI_THEME['button_border']
+        )
+
+        # Class name label
+        class_label = ctk.CTkLabel(
+            class_frame,
+            text=class_name,
+            font=_font(family="Arial", size=14, weight="bold"),
+            text_color=self.UI_THEME['button_fg']
+        )
+        class_label.pack(side="left", padx=15, pady=10)
+
+        # Checkboxes container
+        checkbox_frame = ctk.CTkFrame(class_frame, fg_color="transparent")
+        checkbox_frame.pack(side="right", padx=10)
+
+        # Single Staff checkbox
+        single_staff_cb = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Single Staff",
+            variable=self.class_modifiers[class_name]['single_staff'],
+            command=self.update_requirements,
+            font=_font(family="Arial", size=12),
+            text_color=self.UI_THEME['button_fg'],
+            fg_color=self.UI_THEME['button_bg'],
+            hover_color=self.UI_THEME['button_hover'],
+            border_color=self.UI_THEME['button_border']
+        )
+        single_staff_cb.pack(side="right", padx=10)
+
+        # Girls Only checkbox
+        girls_only_cb = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Girls Only",
+            variable=self.class_modifiers[class_name]['girls_only'],
+            command=self.update_requirements,
+            font=_font(family="Arial", size=12),
+            text_color=self.UI_THEME['button_fg'],
+            fg_color=self.UI_THEME['button_bg'],
+            hover_color=self.UI_THEME['button_hover'],
+            border_color=self.UI_THEME['button_border']
+        )
+        girls_only_cb.pack(side="right", padx=10)
+
+        return class_frame
+
     def show_class_configuration(self):
         try:
             # Get selected classes
@@ -1847,27 +2239,26 @@ class ExamDutyApp:
                 messagebox.showerror("Error", "Please select at least one class")
                 return
 
-            # Clear right panel
+            # Reuse the settings view built for this panel unless the halls have changed since
+            view = self._class_config_view
+            if view is not None and (view['panel'] is not self.right_panel or view['buildings'] is not self.buildings):
+                view = None
+
+            # Clear right panel, keeping the reusable view
+            kept = view['widgets'] if view is not None else ()
             for widget in self.right_panel.winfo_children():
-                widget.destroy()
+                if widget not in kept:
+                    widget.destroy()
 
-            # Title for configuration
-            class_title = ctk.CTkLabel(
-                self.right_panel,
-                text="CONFIGURE CLASS SETTINGS",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
-                text_color=self.UI_THEME['button_fg']
-            )
-            class_title.pack(pady=(15, 10))
+            if view is None:
+                view = self._build_class_config_view()
+                self._class_config_view = view
 
-            # Create scrollable frame for class configurations
-            scroll_frame = ctk.CTkScrollableFrame(
-                self.right_panel,
-                fg_color="transparent"
-            )
-            scroll_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+            # Hide every row, then show the selected ones in order, building any that are new
+            rows = view['rows']
+            for row in rows.values():
+                row.pack_forget()
 
-            # Create configuration frames for each selected class
             for class_name in selected_classes:
                 # Initialize modifiers if not exists
                 if class_name not in self.class_modifiers:
@@ -1877,95 +2268,9 @@ class ExamDutyApp:
                         'single_staff': tk.BooleanVar(value=False)
                     }
 
-                # Create frame for this class
-                class_frame = ctk.CTkFrame(
-                    scroll_frame,
-                    fg_color=self.UI_THEME['content_bg'],
-                    corner_radius=8,
-                    border_width=1,
-                    border_color=self.UI_THEME['button_border']
-                )
-                class_frame.pack(fill="x", padx=5, pady=5)
-
-                # Class name label
-                class_label = ctk.CTkLabel(
-                    class_frame,
-                    text=class_name,
-                    font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                    text_color=self.UI_THEME['button_fg']
-                )
-                class_label.pack(side="left", padx=15, pady=10)
-
-                # Checkboxes container
-                checkbox_frame = ctk.CTkFrame(class_frame, fg_color="transparent")
-                checkbox_frame.pack(side="right", padx=10)
-
-                # Single Staff checkbox
-                single_staff_cb = ctk.CTkCheckBox(
-                    checkbox_frame,
-                    text="Single Staff",
-                    variable=self.class_modifiers[class_name]['single_staff'],
-                    command=self.update_requirements,
-                    font=ctk.CTkFont(family="Arial", size=12),
-                    text_color=self.UI_THEME['button_fg'],
-                    fg_color=self.UI_THEME['button_bg'],
-                    hover_color=self.UI_THEME['button_hover'],
-                    border_color=self.UI_THEME['button_border']
-                )
-                single_staff_cb.pack(side="right", padx=10)
-
-                # Girls Only checkbox
-                girls_only_cb = ctk.CTkCheckBox(
-                    checkbox_frame,
-                    text="Girls Only",
-                    variable=self.class_modifiers[class_name]['girls_only'],
-                    command=self.update_requirements,
-                    font=ctk.CTkFont(family="Arial", size=12),
-                    text_color=self.UI_THEME['button_fg'],
-                    fg_color=self.UI_THEME['button_bg'],
-                    hover_color=self.UI_THEME['button_hover'],
-                    border_color=self.UI_THEME['button_border']
-                )
-                girls_only_cb.pack(side="right", padx=10)
-
-            # Button frame
-            button_frame = ctk.CTkFrame(self.right_panel, fg_color="transparent")
-            button_frame.pack(fill="x", padx=10, pady=10)
-            button_frame.grid_columnconfigure((0, 1), weight=1)
-
-            # Back button
-            back_btn = ctk.CTkButton(
-                button_frame,
-                text="← Back",
-                command=self.create_home_page,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                width=150,
-                height=35,
-                fg_color=self.UI_THEME['button_bg'],
-                text_color=self.UI_THEME['button_fg'],
-                hover_color=self.UI_THEME['button_hover'],
-                border_color=self.UI_THEME['button_border'],
-                border_width=2,
-                corner_radius=8
-            )
-            back_btn.pack(side="left", padx=5)
-
-            # Save Configuration button
-            save_btn = ctk.CTkButton(
-                button_frame,
-                text="Save Configuration →",
-                command=self.save_configuration,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                width=150,
-                height=35,
-                fg_color=self.UI_THEME['button_bg'],
-                text_color=self.UI_THEME['button_fg'],
-                hover_color=self.UI_THEME['button_hover'],
-                border_color=self.UI_THEME['button_border'],
-                border_width=2,
-                corner_radius=8
-            )
-            save_btn.pack(side="right", padx=5)
+                if class_name not in rows:
+                    rows[class_name] = self._build_class_config_row(view['scroll_frame'], class_name)
+                rows[class_name].pack(fill="x", padx=5, pady=5)
 
             # Update requirements based on current configuration
             self.update_requirements()
@@ -1978,8 +2283,7 @@ class ExamDutyApp:
     def add_exam_details(self):
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
 
             # Create main container
             main_container = ctk.CTkFrame(self.app, fg_color="transparent")
@@ -2002,23 +2306,6 @@ class ExamDutyApp:
             form_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
             form_frame.pack(fill="both", expand=True, padx=40, pady=30)
 
-            # Common styles
-            label_style = {
-                "font": ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                "text_color": self.UI_THEME['button_fg']
-            }
-
-            entry_style = {
-                "font": ctk.CTkFont(family="Arial", size=13),
-                "height": 40,
-                "corner_radius": 8,
-                "border_width": 2,
-                "border_color": self.UI_THEME['button_border'],
-                "fg_color": "#ffffff",
-                "text_color": "#000000",
-                "placeholder_text_color": "#666666"
-            }
-
             # Create input fields with consistent spacing
             input_fields = [
                 {
@@ -2044,14 +2331,14 @@ class ExamDutyApp:
                 ctk.CTkLabel(
                     form_frame, 
                     text=field["label"], 
-                    **label_style
+                    **self.FORM_LABEL_STYLE
                 ).pack(anchor="w", pady=(0, 5))
 
                 # Entry
                 entry = ctk.CTkEntry(
                     form_frame,
                     placeholder_text=field["placeholder"],
-                    **entry_style
+                    **self.FORM_ENTRY_STYLE
                 )
                 entry.pack(fill="x", pady=(0, 20))
                 setattr(self, field["variable"], entry)
@@ -2060,14 +2347,14 @@ class ExamDutyApp:
             ctk.CTkLabel(
                 form_frame, 
                 text="Additional Details", 
-                **label_style
+                **self.FORM_LABEL_STYLE
             ).pack(anchor="w", pady=(0, 5))
 
             # Details textbox
             details_text = ctk.CTkTextbox(
                 form_frame,
                 height=120,
-                font=ctk.CTkFont(family="Arial", size=13),
+                font=_font(family="Arial", size=13),
                 fg_color="#ffffff",
                 text_color="#000000",
                 corner_radius=8,
@@ -2090,16 +2377,6 @@ class ExamDutyApp:
             button_frame.pack(fill="x", pady=10)
             button_frame.grid_columnconfigure((0, 1), weight=1)
 
-            # Button style
-            button_style = {
-                "font": ctk.CTkFont(family="Arial", size=14, weight="bold"),
-                "width": 150,
-                "height": 40,
-                "corner_radius": 8,
-                "border_width": 2,
-                "border_color": self.UI_THEME['button_border']
-            }
-
             # Back button
             back_btn = ctk.CTkButton(
                 button_frame,
@@ -2108,7 +2385,7 @@ class ExamDutyApp:
                 fg_color=self.UI_THEME['button_bg'],
                 text_color=self.UI_THEME['button_fg'],
                 hover_color=self.UI_THEME['button_hover'],
-                **button_style
+                **self.FORM_BUTTON_STYLE
             )
             back_btn.grid(row=0, column=0, padx=10)
 
@@ -2120,7 +2397,7 @@ class ExamDutyApp:
                 fg_color=self.UI_THEME['button_bg'],
                 text_color=self.UI_THEME['button_fg'],
                 hover_color=self.UI_THEME['button_hover'],
-                **button_style
+                **self.FORM_BUTTON_STYLE
             )
             generate_btn.grid(row=0, column=1, padx=10)
 
@@ -2149,12 +2426,11 @@ class ExamDutyApp:
         Returns: tuple (total_staff, female_staff, male_staff)
         """
         try:
-            with open(DB_FILES['staff'], 'r') as f:
-                staff_data = json.load(f)
+            staff_index = self._get_staff_index()
             
-            total_staff = len(staff_data)
-            female_staff = len([s for s in staff_data if s.get('staff_gender', '').upper() in ['F', 'FEMALE']])
-            male_staff = len([s for s in staff_data if s.get('staff_gender', '').upper() in ['M', 'MALE']])
+            total_staff = staff_index.total
+            female_staff = staff_index.female_total
+            male_staff = staff_index.male_total
             
             print(f"Staff statistics - Total: {total_staff}, Female: {female_staff}, Male: {male_staff}")
             return total_staff, female_staff, male_staff
@@ -2171,20 +2447,14 @@ class ExamDutyApp:
             total_required = 0
             female_required = 0
             
-            for room_no in self.available_classes:
-                girls_only = self.room_frames[room_no].winfo_children()[1].variable.get()
-                single_staff = self.room_frames[room_no].winfo_children()[2].variable.get()
-                
-                if single_staff:
-                    # Single staff required
-                    total_required += 1
-                    if girls_only:
-                        female_required += 1
-                else:
-                    # Two staff required
-                    total_required += 2
-                    if girls_only:
-                        female_required += 2
+            # Read the modifier BooleanVars directly rather than walking the room widgets;
+            # each selected class needs two staff, or one with single staff, all female if girls only
+            for modifiers in self.class_modifiers.values():
+                if not modifiers['selected'].get():
+                    continue
+                staff_needed = 2 - modifiers['single_staff'].get()
+                total_required += staff_needed
+                female_required += staff_needed * modifiers['girls_only'].get()
             
             # Male staff can fill any non-female-required positions
             male_possible = total_required - female_required
@@ -2201,22 +2471,37 @@ class ExamDutyApp:
         - Girls Only: Two female staff members
         - Single Staff: One staff member (any gender)
         - Both modifiers (Girls Only + Single Staff): One female staff member
+        staff_list is not modified
         """
         try:
-            # Load excluded staff
-            excluded_staff_file = os.path.join('data', 'excluded_staff.json')
-            if os.path.exists(excluded_staff_file):
-                with open(excluded_staff_file, 'r') as f:
-                    excluded_staff = set(json.load(f))
-                
-                # Remove excluded staff from the allocation pool
+            # Load excluded staff (cached until the file changes)
+            excluded_staff = self._get_excluded_staff()
+
+            # Remove excluded staff from the allocation pool
+            if excluded_staff:
                 staff_list = [s for s in staff_list if s['staff_name'].strip() not in excluded_staff]
 
-            # Randomize staff list to ensure fair distribution
-            random.shuffle(staff_list)
+            # Randomize staff list to ensure fair distribution; the freshly filtered
+            # list is shuffled in place, the caller's list is only ever read
+            if excluded_staff:
+                random.shuffle(staff_list)
+            else:
+                staff_list = random.sample(staff_list, len(staff_list))
             
             # Initialize allotments list
             allotments = []
+
+            # Staff are drawn from the front of the shuffled pool; assigned staff
+            # are tracked by id and skipped rather than removed from the list
+            any_pool = deque(staff_list)
+            assigned = set()
+
+            # Female staff are partitioned once, in the same shuffled order,
+            # for girls-only rooms
+            female_pool = deque(
+                s for s in staff_list
+                if _gender_code(s) == 'F'
+            )
             
             # Process each room
             for class_info in classes_list:
@@ -2225,11 +2510,7 @@ class ExamDutyApp:
                 single_staff = class_info['single_staff']
                 
                 # Filter eligible staff based on room requirements
-                eligible_staff = []
-                if girls_only:
-                    eligible_staff = [s for s in staff_list if s.get('staff_gender', '').upper() in ['F', 'FEMALE']]
-                else:
-                    eligible_staff = staff_list.copy()
+                eligible_staff = female_pool if girls_only else any_pool
                 
                 # Determine number of staff needed
                 staff_needed = 1 if single_staff else 2
@@ -2237,9 +2518,11 @@ class ExamDutyApp:
                 # Select required number of staff
                 selected_staff = []
                 while len(selected_staff) < staff_needed and eligible_staff:
-                    staff = eligible_staff.pop(0)
+                    staff = eligible_staff.popleft()
+                    if id(staff) in assigned:
+                        continue
+                    assigned.add(id(staff))  # Mark as taken for every later room
                     selected_staff.append(staff)
-                    staff_list.remove(staff)  # Remove from main available pool
                 
                 # Add to allotments if staff was assigned
                 if selected_staff:
@@ -2259,8 +2542,7 @@ class ExamDutyApp:
         """Enter assessment details page"""
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
 
             # Create main container
             main_container = ctk.CTkFrame(self.app)
@@ -2269,7 +2551,7 @@ class ExamDutyApp:
             # Title
             title_label = ctk.CTkLabel(main_container, 
                                    text="Enter Assessment Details", 
-                                   font=ctk.CTkFont(size=20, weight="bold"))
+                                   font=_font(size=20, weight="bold"))
             title_label.pack(pady=20)
 
             # Create form frame
@@ -2277,7 +2559,7 @@ class ExamDutyApp:
             form_frame.pack(pady=20, padx=60, fill="x")
 
             # Exam Month
-            month_label = ctk.CTkLabel(form_frame, text="Exam Month:", font=ctk.CTkFont(size=14))
+            month_label = ctk.CTkLabel(form_frame, text="Exam Month:", font=_font(size=14))
             month_label.pack(anchor="w", pady=(0, 5))
 
             self.exam_month_var = tk.StringVar(value="")
@@ -2285,14 +2567,14 @@ class ExamDutyApp:
             month_entry.pack(anchor="w", pady=(0, 15))
 
             # Assessment Name
-            assessment_label = ctk.CTkLabel(form_frame, text="Assessment Name:", font=ctk.CTkFont(size=14))
+            assessment_label = ctk.CTkLabel(form_frame, text="Assessment Name:", font=_font(size=14))
             assessment_label.pack(anchor="w", pady=(0, 5))
             self.assessment_name_var = tk.StringVar(value="")
             assessment_entry = ctk.CTkEntry(form_frame, textvariable=self.assessment_name_var, width=200)
             assessment_entry.pack(anchor="w", pady=(0, 15))
 
             # Reporting Time
-            time_label = ctk.CTkLabel(form_frame, text="Reporting Time:", font=ctk.CTkFont(size=14))
+            time_label = ctk.CTkLabel(form_frame, text="Reporting Time:", font=_font(size=14))
             time_label.pack(anchor="w", pady=(0, 5))
             self.reporting_time_var = tk.StringVar(value="")
             time_entry = ctk.CTkEntry(form_frame, textvariable=self.reporting_time_var, width=200)
@@ -2306,21 +2588,21 @@ class ExamDutyApp:
             back_btn = ctk.CTkButton(buttons_frame, 
                                   text="Back", 
                                   command=self.create_home_page,
-                                  font=ctk.CTkFont(size=14))
+                                  font=_font(size=14))
             back_btn.pack(side="left", padx=10)
 
             # Generate Staff Report button
             staff_report_btn = ctk.CTkButton(buttons_frame, 
                                          text="Generate Staff Report", 
                                          command=self.generate_staff_report,
-                                         font=ctk.CTkFont(size=14))
+                                         font=_font(size=14))
             staff_report_btn.pack(side="left", padx=10)
 
             # Next button
             next_btn = ctk.CTkButton(buttons_frame, 
                                   text="Next", 
                                   command=self.save_and_preview,
-                                  font=ctk.CTkFont(size=14))
+                                  font=_font(size=14))
             next_btn.pack(side="left", padx=10)
 
         except Exception as e:
@@ -2329,10 +2611,12 @@ class ExamDutyApp:
 
     def generate_allotment_pdf(self):
         try:
+            # Make sure all date configurations are on disk
+            self.config_manager.flush()
+
             # Get settings for selected dates
-            with open(DB_FILES['settings'], 'r') as f:
-                settings = json.load(f)
-                selected_dates = settings.get('dates', [])
+            settings = self._load_json(DB_FILES['settings'])
+            selected_dates = settings.get('dates', [])
 
             if not selected_dates:
                 messagebox.showerror("Error", "No dates selected")
@@ -2343,8 +2627,7 @@ class ExamDutyApp:
             os.makedirs(output_dir, exist_ok=True)
 
             # Load staff data
-            with open(DB_FILES['staff'], 'r') as f:
-                staff_list = json.load(f)
+            staff_list = self._load_json(DB_FILES['staff'])
 
             # Generate allotments for each date
             self.allotments = {}
@@ -2355,7 +2638,7 @@ class ExamDutyApp:
                     continue
 
                 # Generate allotment for this date
-                self.allotments[date_str] = self.allocate_staff(staff_list.copy(), config['rooms'], date_str)
+                self.allotments[date_str] = self.allocate_staff(staff_list, config['rooms'], date_str)
 
                 # Generate PDF for this date
                 pdf_settings = {
@@ -2367,8 +2650,7 @@ class ExamDutyApp:
                 self.generate_pdf(self.allotments[date_str], pdf_settings)
 
             # Save all allotments
-            with open(DB_FILES['allotment'], 'w') as f:
-                json.dump(self.allotments, f, indent=4)
+            _write_atomic(DB_FILES['allotment'], _json_dumps(self.allotments, compact=True))  # Machine-read, so no indentation
 
             messagebox.showinfo("Success", "Allotment PDFs generated successfully")
         except Exception as e:
@@ -2383,10 +2665,12 @@ class ExamDutyApp:
             os.makedirs(output_dir, exist_ok=True)
 
             # Create PDF
-            date_str = datetime.strptime(settings['date'], '%Y-%m-%d').strftime('%d-%m-%Y')
+            exam_date = datetime.strptime(settings['date'], '%Y-%m-%d')
+            date_str = exam_date.strftime('%d-%m-%Y')
             pdf_path = os.path.join(output_dir, f'allotment_{date_str}.pdf')
             
-            doc = SimpleDocTemplate(pdf_path, pagesize=letter)
+            pdf_buffer = io.BytesIO()  # Built in memory, written to disk in one go
+            doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
             elements = []
 
             # Add logo
@@ -2398,22 +2682,14 @@ class ExamDutyApp:
                 elements.append(Spacer(1, 20))
 
             # Title with complete details
-            month = datetime.strptime(settings['date'], '%Y-%m-%d').strftime('%B')
-            year = datetime.strptime(settings['date'], '%Y-%m-%d').strftime('%Y')
+            month = exam_date.strftime('%B')
+            year = exam_date.strftime('%Y')
             title_text = f"""Office of the Controller of Examinations<br/>{month} - {year} {settings['assessment_name']} Examination Duty List<br/>Reporting Time-{settings['reporting_time']}<br/>Date of Examination-{date_str}"""
 
-            styles = getSampleStyleSheet()
-            title_style = styles['Title']
-            title_style.alignment = 1  # Center alignment
-            title_style.spaceAfter = 30
-            title_style.fontSize = 12
-            title_style.leading = 16
+            title_style = self.PDF_TITLE_STYLE
 
             elements.append(Paragraph(title_text, title_style))
 
-            # Create table data
-            table_data = [['S. No.', 'Staff Name', 'Dept', 'Hall', 'Reporting Time', 'Signature']]
-            
             # Convert allotments list to room-based dictionary if needed
             room_allotments = {}
             if isinstance(allotments, list):
@@ -2422,29 +2698,28 @@ class ExamDutyApp:
                     room_allotments[room_no] = allot['staff']
             else:
                 room_allotments = allotments
-            
-            
-            idx = 1
-            for room_no in room_allotments:
-                staff_list = room_allotments[room_no]
-                for staff in staff_list:
-                    table_data.append([
-                        idx,
-                        staff.get('staff_name', staff.get('name', '')).strip(),
-                        staff.get('staff_dept', staff.get('department', '')).strip(),
-                        room_no.strip(),
-                        '',  # Empty reporting time column
-                        ''   # Empty signature column
-                    ])
-                    idx += 1
-            if len(table_data) > 1:
-                first_row = table_data[0]  # Store first element
-                sorted_data = sorted(table_data[1:], key=lambda x: x[2])  # Sort by department
-                table_data = [first_row] + sorted_data  # Reconstruct with first row unchanged
-
-            # Update serial numbers after sorting
-            for idx, row in enumerate(table_data[1:], start=1):
-                row[0] = idx  # Assign new serial number
+
+            # Build one row per assigned staff member; serial numbers are filled in after sorting
+            rows = [
+                [
+                    0,
+                    staff.get('staff_name', staff.get('name', '')).strip(),
+                    staff.get('staff_dept', staff.get('department', '')).strip(),
+                    room_no.strip(),
+                    '',  # Empty reporting time column
+                    ''   # Empty signature column
+                ]
+                for room_no, staff_list in room_allotments.items()
+                for staff in staff_list
+            ]
+            rows.sort(key=itemgetter(2))  # Sort by department
+
+            # Assign serial numbers after sorting
+            for idx, row in enumerate(rows, start=1):
+                row[0] = idx
+
+            # Create table data
+            table_data = [['S. No.', 'Staff Name', 'Dept', 'Hall', 'Reporting Time', 'Signature'], *rows]
 
             # Create table with specific column widths
             table = Table(table_data, colWidths=[35, 140, 100, 60, 105, 85])
@@ -2483,6 +2758,8 @@ class ExamDutyApp:
             
             # Build PDF
             doc.build(elements)
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_buffer.getbuffer())
 
         except Exception as e:
             print(f"Error generating PDF: {str(e)}")
@@ -2496,160 +2773,155 @@ class ExamDutyApp:
             os.makedirs(output_dir, exist_ok=True)
 
             # Load all staff data
-            with open(DB_FILES['staff'], 'r') as f:
-                staff_list = json.load(f)
+            staff_list = self._load_json(DB_FILES['staff'])
 
             # Group staff by department
-            dept_staff = {}
+            dept_staff = defaultdict(list)
             for staff in staff_list:
-                dept = staff.get('staff_dept', '').strip()
-                if dept not in dept_staff:
-                    dept_staff[dept] = []
-                dept_staff[dept].append(staff)
+                dept_staff[staff.get('staff_dept', '').strip()].append(staff)
+
+            # Sort each department by name once, rather than once per page
+            for dept_list in dept_staff.values():
+                dept_list.sort(key=itemgetter('staff_name'))
 
             # Load allotments
-            with open(DB_FILES['allotment'], 'r') as f:
-                all_allotments = json.load(f)
+            all_allotments = self._load_json(DB_FILES['allotment'])
 
-            # Generate report for each department
-            for dept in sorted(dept_staff.keys()):
-                # Create PDF
-                pdf_path = os.path.join(output_dir, f'staff_report_{dept}.pdf')
-                doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-                elements = []
-
-                # Add logo
-                logo_path = r"assets\logo.jpg"
-                if os.path.exists(logo_path):
-                    logo = Image(logo_path, width=400, height=55)
-                    logo.hAlign = 'CENTER'
-                    elements.append(logo)
-                    elements.append(Spacer(1, 20))
-
-                # Add title
-                title_text = f"""Office of the Controller of Examinations<br/>
-                               Staff Duty Report - {dept} Department<br/>
-                               {self.exam_month_var.get()} {self.assessment_name_var.get()}<br/>"""
-                styles = getSampleStyleSheet()
-                title_style = styles['Title']
-                title_style.alignment = 1  # Center alignment
-                title = Paragraph(title_text, title_style)
-                elements.append(title)
-                elements.append(Spacer(1, 20))
+            # Index each staff member's room per date in one pass over the allotments
+            room_lookup = {}
+            for date, date_allotments in all_allotments.items():
+                if isinstance(date_allotments, dict):
+                    entries = date_allotments.items()
+                else:
+                    entries = ((a.get('room_no', ''), a.get('staff', [])) for a in date_allotments)
+                for room_no, room_staff in entries:
+                    for s in room_staff:
+                        # Keep the first room found, as the per-cell search did
+                        room_lookup.setdefault((date, s.get('staff_name', '').strip()), f"{room_no}")
 
-                # Get all dates
-                dates = sorted(all_allotments.keys())
-                
-                # Calculate dates per page (considering fixed column widths and minimum date column width)
-                fixed_width = 200  # Width for S.No, Name, Gender columns
-                available_width = 520  # Total available width for letter size
-                min_date_width = 60  # Minimum width for each date column
-                dates_per_page = (available_width - fixed_width) // min_date_width
-                
-                # Split dates into chunks
-                date_chunks = [dates[i:i + dates_per_page] for i in range(0, len(dates), dates_per_page)]
-                
-                # Create tables for each chunk of dates
-                for page_num, date_chunk in enumerate(date_chunks):
-                    if page_num > 0:
-                        elements.append(PageBreak())
-                        elements.append(Paragraph(title_text, title_style))
-                        elements.append(Spacer(1, 20))
-                    
-                    # Create headers for this chunk
-                    headers = ['S.No', 'Staff Name', 'Gender'] + [
-                        datetime.strptime(date, '%Y-%m-%d').strftime('%d-%m-%Y') 
-                        for date in date_chunk
-                    ]
-                    
-                    # Prepare table data
-                    data = [headers]
-                    
-                    # Add staff rows
-                    for idx, staff in enumerate(sorted(dept_staff[dept], key=lambda x: x['staff_name']), 1):
-                        staff_name = staff['staff_name'].strip()
-                        staff_gender = staff['staff_gender'].strip()
-                        
-                        date_allocations = []
-                        for date in date_chunk:
-                            allocated = '-'
-                            date_allotments = all_allotments.get(date, [])
-                            if isinstance(date_allotments, dict):
-                                for room_no, room_staff in date_allotments.items():
-                                    for s in room_staff:
-                                        if s.get('staff_name', '').strip() == staff_name:
-                                            allocated = f"{room_no}"
-                                            break
-                                    if allocated != '-':
-                                        break
-                            else:
-                                for allotment in date_allotments:
-                                    room_no = allotment.get('room_no', '')
-                                    for s in allotment.get('staff', []):
-                                        if s.get('staff_name', '').strip() == staff_name:
-                                            allocated = f"{room_no}"
-                                            break
-                                    if allocated != '-':
-                                        break
-                            date_allocations.append(allocated)
-                        
-                        row = [str(idx), staff_name, staff_gender] + date_allocations
-                        data.append(row)
+            # Get all dates, formatted for the column headers once for every department
+            dates = sorted(all_allotments.keys())
+            date_headers = {d: datetime.strptime(d, '%Y-%m-%d').strftime('%d-%m-%Y') for d in dates}
 
-                    # Calculate column widths for this chunk
-                    date_width = min(70, (available_width - fixed_width) / len(date_chunk))
-                    col_widths = [30, 120, 50] + [date_width] * len(date_chunk)
-                    
-                    # Create and style table
-                    table = Table(data, colWidths=col_widths)
-                    table.setStyle(TableStyle([
-                        # Header style
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        
-                        # Content style
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 1), (-1, -1), 8),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        
-                        # Alternate row colors
-                        *[('BACKGROUND', (0, i), (-1, i), colors.whitesmoke) 
-                          for i in range(2, len(data), 2)]
-                    ]))
-                    
-                    elements.append(table)
-                    
-                    # Add signature only on the last page
-                    if page_num == len(date_chunks) - 1:
-                        signature_path = r"assets\signature.jpg"
-                        if os.path.exists(signature_path):
-                            elements.append(Spacer(1, 50))
-                            signature = Image(signature_path, width=100, height=50)
-                            signature.hAlign = 'RIGHT'
-                            elements.append(signature)
-                
-                # Build PDF
-                doc.build(elements)
+            # Exam month and assessment name shown in every report title
+            exam_title = f"{self.exam_month_var.get()} {self.assessment_name_var.get()}"
+
+            # Generate report for each department
+            for dept in sorted(dept_staff.keys()):
+                self._build_dept_report(dept, dept_staff[dept], dates, date_headers, room_lookup, output_dir, exam_title)
 
             messagebox.showinfo("Success", f"Staff reports have been generated in {output_dir} folder!")
-            os.startfile(output_dir)
+            self.app.after(0, self._open_folder, output_dir)
 
         except Exception as e:
             print(f"Error generating staff report: {str(e)}")
             print(f"Error details: {traceback.format_exc()}")
             messagebox.showerror("Error", f"Error generating staff report: {str(e)}")
 
+    def _build_dept_report(self, dept, dept_list, dates, date_headers, room_lookup, output_dir, exam_title):
+        """Build one department's staff duty report PDF"""
+        # Create PDF
+        pdf_path = os.path.join(output_dir, f'staff_report_{dept}.pdf')
+        pdf_buffer = io.BytesIO()  # Built in memory, written to disk in one go
+        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
+        elements = []
+
+        # Add logo
+        logo_path = r"assets\logo.jpg"
+        if os.path.exists(logo_path):
+            logo = Image(logo_path, width=400, height=55)
+            logo.hAlign = 'CENTER'
+            elements.append(logo)
+            elements.append(Spacer(1, 20))
+
+        # Add title
+        title_text = f"""Office of the Controller of Examinations<br/>
+                       Staff Duty Report - {dept} Department<br/>
+                       {exam_title}<br/>"""
+        title_style = self.REPORT_TITLE_STYLE
+        title = Paragraph(title_text, title_style)
+        elements.append(title)
+        elements.append(Spacer(1, 20))
+        
+        # Calculate dates per page (considering fixed column widths and minimum date column width)
+        fixed_width = 200  # Width for S.No, Name, Gender columns
+        available_width = 520  # Total available width for letter size
+        min_date_width = 60  # Minimum width for each date column
+        dates_per_page = (available_width - fixed_width) // min_date_width
+        
+        # Split dates into chunks
+        date_chunks = [dates[i:i + dates_per_page] for i in range(0, len(dates), dates_per_page)]
+        
+        # Create tables for each chunk of dates
+        for page_num, date_chunk in enumerate(date_chunks):
+            if page_num > 0:
+                elements.append(PageBreak())
+                elements.append(Paragraph(title_text, title_style))
+                elements.append(Spacer(1, 20))
+            
+            # Create headers for this chunk
+            headers = ['S.No', 'Staff Name', 'Gender'] + [date_headers[date] for date in date_chunk]
+            
+            # Prepare table data, sized up front for the header plus one row per staff member
+            data = [None] * (len(dept_list) + 1)
+            data[0] = headers
+            
+            # Add staff rows; the serial number doubles as the row index
+            for idx, staff in enumerate(dept_list, 1):
+                staff_name = staff['staff_name'].strip()
+                staff_gender = staff['staff_gender'].strip()
+                
+                date_allocations = [room_lookup.get((date, staff_name), '-') for date in date_chunk]
+                
+                data[idx] = [str(idx), staff_name, staff_gender, *date_allocations]
+
+            # Calculate column widths for this chunk
+            date_width = min(70, (available_width - fixed_width) / len(date_chunk))
+            col_widths = [30, 120, 50] + [date_width] * len(date_chunk)
+            
+            # Create and style table
+            table = Table(data, colWidths=col_widths)
+            table.setStyle(TableStyle([
+                # Header style
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                
+                # Content style
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                
+                # Alternate row colors
+                *[('BACKGROUND', (0, i), (-1, i), colors.whitesmoke) 
+                  for i in range(2, len(data), 2)]
+            ]))
+            
+            elements.append(table)
+            
+            # Add signature only on the last page
+            if page_num == len(date_chunks) - 1:
+                signature_path = r"assets\signature.jpg"
+                if os.path.exists(signature_path):
+                    elements.append(Spacer(1, 50))
+                    signature = Image(signature_path, width=100, height=50)
+                    signature.hAlign = 'RIGHT'
+                    elements.append(signature)
+        
+        # Build PDF
+        doc.build(elements)
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf_buffer.getbuffer())
+
     def show_room_configuration(self):
         # Clear main content area
-        for widget in self.app.winfo_children():
-            widget.destroy()
+        self._clear_window()
 
         # Create main container with black background
         main_container = ctk.CTkFrame(self.app, fg_color="#000000")
@@ -2665,7 +2937,7 @@ class ExamDutyApp:
             header_content,
             text="← Back",
             command=self.create_home_page,
-            font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+            font=_font(family="Arial", size=14, weight="bold"),
             width=100,
             height=40,
             fg_color="#ffffff",
@@ -2681,7 +2953,7 @@ class ExamDutyApp:
         title_label = ctk.CTkLabel(
             header_content,
             text="ROOM CONFIGURATION",
-            font=ctk.CTkFont(family="Arial", size=28, weight="bold"),
+            font=_font(family="Arial", size=28, weight="bold"),
             text_color="#ffffff"
         )
         title_label.grid(row=0, column=1)
@@ -2701,7 +2973,7 @@ class ExamDutyApp:
         left_title = ctk.CTkLabel(
             left_panel,
             text="HALLS",
-            font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
+            font=_font(family="Arial", size=24, weight="bold"),
             text_color="#000000"
         )
         left_title.pack(pady=(20, 10), anchor="n")
@@ -2712,19 +2984,19 @@ class ExamDutyApp:
 
         # Load halls data
         try:
-            with open(DB_FILES['halls'], 'r') as f:
-                halls = json.load(f)
+            halls = self._load_json(DB_FILES['halls'])
         except:
             halls = {}
 
         # Add hall buttons with white background and black border
+        self._hall_buttons = {}
         for hall_name in sorted(halls.keys()):
             hall_btn = ctk.CTkButton(
                 halls_scroll,
                 text=hall_name,
-                command=lambda h=hall_name: self.refresh_hall_details(h, right_panel),
+                command=partial(self.refresh_hall_details, hall_name, right_panel),
                 height=40,
-                font=ctk.CTkFont(family="Arial", size=14),
+                font=_font(family="Arial", size=14),
                 fg_color="#ffffff",
                 text_color="#000000",
                 hover_color="#f0f0f0",
@@ -2733,14 +3005,15 @@ class ExamDutyApp:
                 corner_radius=8
             )
             hall_btn.pack(fill="x", pady=5)
+            self._hall_buttons[hall_name] = hall_btn
 
         # Add "Add Hall" button at the bottom of left panel
         add_hall_btn = ctk.CTkButton(
             left_panel,
             text="+ Add New Hall",
-            command=lambda: self.show_add_hall_form(halls_scroll, right_panel),
+            command=partial(self.show_add_hall_form, halls_scroll, right_panel),
             height=40,
-            font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+            font=_font(family="Arial", size=14, weight="bold"),
             fg_color="#ffffff",
             text_color="#000000",
             hover_color="#f0f0f0",
@@ -2751,143 +3024,225 @@ class ExamDutyApp:
         add_hall_btn.pack(fill="x", padx=10, pady=10)
 
         # Right Panel - Initial Message
+        self._show_hall_welcome(right_panel)
+
+    def _show_hall_welcome(self, right_panel):
+        """Show the initial prompt in the room configuration right panel"""
         welcome_label = ctk.CTkLabel(
             right_panel,
             text="Select a hall from the left panel\nor add a new hall to begin",
-            font=ctk.CTkFont(family="Arial", size=16),
+            font=_font(family="Arial", size=16),
             text_color="#000000",
             justify="center"
         )
         welcome_label.pack(anchor="n", pady=20)
 
     def refresh_hall_details(self, hall_name, right_panel):
-        # Clear right panel
-        for widget in right_panel.winfo_children():
-            widget.destroy()
-
         try:
             # Load halls data
-            with open(DB_FILES['halls'], 'r') as f:
-                self.buildings = json.load(f)  # Load into self.buildings to maintain compatibility
-
-            # Create title frame at the top
-            title_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
-            title_frame.pack(fill="x", padx=20, pady=(20,10), anchor="n")
-
-            # Add hall name title
-            title = ctk.CTkLabel(
-                title_frame,
-                text=f"{hall_name} Configuration",
-                font=ctk.CTkFont(family="Arial", size=20, weight="bold"),
-                text_color="#000000"
-            )
-            title.pack(side="left")
-
-            # Add delete hall button
-            delete_hall_btn = ctk.CTkButton(
-                title_frame,
-                text="Delete Hall",
-                command=lambda: self.delete_hall(hall_name, right_panel),
-                fg_color="#ffffff",
-                text_color="#000000",
-                hover_color="#f0f0f0",
-                border_color="#FF0000",
-                border_width=2,
-                corner_radius=8,
-                width=120,
-                height=35,
-                font=ctk.CTkFont(family="Arial", size=14)
-            )
-            delete_hall_btn.pack(side="right")
-
-            # Create content frame
-            content_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
-            content_frame.pack(fill="both", expand=True, padx=20, pady=(0,20))
-
-            # Create scrollable frame for rooms
-            rooms_frame = ctk.CTkScrollableFrame(content_frame, fg_color="transparent")
-            rooms_frame.pack(fill="both", expand=True)
+            self.set_buildings(self._load_json(DB_FILES['halls']))  # Load into self.buildings to maintain compatibility
+
+            view = self._hall_view
+            if view is not None and view['panel'] is right_panel and view['rooms_frame'].winfo_exists():
+                # Same panel still showing hall details: return the room rows to the pool
+                # and point the existing header and add-room controls at the new hall
+                for row in view['rows'].values():
+                    self._release_room_row(row)
+                view['rows'] = {}
+                view['hall'] = hall_name
+                view['title'].configure(text=f"{hall_name} Configuration")
+                view['delete_hall_btn'].configure(command=partial(self.delete_hall, hall_name, right_panel))
+                view['add_btn'].configure(command=partial(self.add_room, hall_name, view['room_var'], right_panel))
+                view['room_var'].set("")
+            else:
+                view = self._build_hall_view(hall_name, right_panel)
 
             # Add rooms list
             if hall_name in self.buildings:  # Using self.buildings which now has data from halls.json
                 rooms = self.buildings[hall_name]
                 for room in sorted(rooms):
-                    room_frame = ctk.CTkFrame(rooms_frame, fg_color="#ffffff", border_color="#000000", border_width=1, corner_radius=8)
-                    room_frame.pack(fill="x", padx=5, pady=5)
-
-                    room_label = ctk.CTkLabel(
-                        room_frame,
-                        text=room,
-                        font=ctk.CTkFont(family="Arial", size=14),
-                        text_color="#000000"
-                    )
-                    room_label.pack(side="left", padx=10, pady=10)
-
-                    delete_btn = ctk.CTkButton(
-                        room_frame,
-                        text="Delete",
-                        command=lambda r=room: self.delete_room(hall_name, r, right_panel),
-                        fg_color="#ffffff",
-                        text_color="#000000",
-                        hover_color="#f0f0f0",
-                        border_color="#FF0000",
-                        border_width=2,
-                        corner_radius=8,
-                        width=80,
-                        height=30,
-                        font=ctk.CTkFont(family="Arial", size=12)
-                    )
-                    delete_btn.pack(side="right", padx=10, pady=10)
+                    self._acquire_room_row(hall_name, room, right_panel)
 
-            # Add new room section at the bottom
-            add_room_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-            add_room_frame.pack(fill="x", pady=(20,0))
+        except Exception as e:
+            print(f"Error refreshing hall details: {str(e)}")
+            messagebox.showerror("Error", f"Failed to refresh hall details: {str(e)}")
 
-            room_var = tk.StringVar()
-            room_entry = ctk.CTkEntry(
-                add_room_frame,
-                textvariable=room_var,
-                placeholder_text="Enter room number",
-                width=200,
-                height=35,
-                font=ctk.CTkFont(family="Arial", size=14),
-                border_color="#000000",
-                border_width=2
+    def _build_hall_view(self, hall_name, right_panel):
+        """Build the hall details widgets in right_panel and return them as the current hall view"""
+        # Clear right panel
+        for widget in right_panel.winfo_children():
+            widget.destroy()
+
+        # Create title frame at the top
+        title_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
+        title_frame.pack(fill="x", padx=20, pady=(20,10), anchor="n")
+
+        # Add hall name title
+        title = ctk.CTkLabel(
+            title_frame,
+            text=f"{hall_name} Configuration",
+            font=_font(family="Arial", size=20, weight="bold"),
+            text_color="#000000"
+        )
+        title.pack(side="left")
+
+        # Add delete hall button
+        delete_hall_btn = ctk.CTkButton(
+            title_frame,
+            text="Delete Hall",
+            command=partial(self.delete_hall, hall_name, right_panel),
+            fg_color="#ffffff",
+            text_color="#000000",
+            hover_color="#f0f0f0",
+            border_color="#FF0000",
+            border_width=2,
+            corner_radius=8,
+            width=120,
+            height=35,
+            font=_font(family="Arial", size=14)
+        )
+        delete_hall_btn.pack(side="right")
+
+        # Create content frame
+        content_frame = ctk.CTkFrame(right_panel, fg_color="transparent")
+        content_frame.pack(fill="both", expand=True, padx=20, pady=(0,20))
+
+        # Create scrollable frame for rooms
+        rooms_frame = ctk.CTkScrollableFrame(content_frame, fg_color="transparent")
+        rooms_frame.pack(fill="both", expand=True)
+
+        # Add new room section at the bottom
+        add_room_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        add_room_frame.pack(fill="x", pady=(20,0))
+
+        room_var = tk.StringVar()
+        room_entry = ctk.CTkEntry(
+            add_room_frame,
+            textvariable=room_var,
+            placeholder_text="Enter room number",
+            width=200,
+            height=35,
+            font=_font(family="Arial", size=14),
+            border_color="#000000",
+            border_width=2
+        )
+        room_entry.pack(side="left", padx=(0,10))
+
+        add_btn = ctk.CTkButton(
+            add_room_frame,
+            text="+ Add Room",
+            command=partial(self.add_room, hall_name, room_var, right_panel),
+            width=120,
+            height=35,
+            font=_font(family="Arial", size=14, weight="bold"),
+            fg_color="#ffffff",
+            text_color="#000000",
+            hover_color="#f0f0f0",
+            border_color="#000000",
+            border_width=2,
+            corner_radius=8
+        )
+        add_btn.pack(side="left")
+
+        # Rows shown for this hall are patched in place by add_room and delete_room;
+        # released rows wait in the pool to be reused for the next hall
+        self._hall_view = {
+            'panel': right_panel,
+            'hall': hall_name,
+            'title': title,
+            'delete_hall_btn': delete_hall_btn,
+            'rooms_frame': rooms_frame,
+            'room_var': room_var,
+            'add_btn': add_btn,
+            'rows': {},
+            'pool': []
+        }
+        return self._hall_view
+
+    def _acquire_room_row(self, hall_name, room, right_panel, before=None):
+        """Show the row for one room in the hall details view, reusing a pooled row when available"""
+        view = self._hall_view
+        if view['pool']:
+            row = view['pool'].pop()
+            room_frame, room_label, delete_btn = row
+            room_label.configure(text=room)
+            delete_btn.configure(command=partial(self.delete_room, hall_name, room, right_panel))
+        else:
+            room_frame = ctk.CTkFrame(view['rooms_frame'], fg_color="#ffffff", border_color="#000000", border_width=1, corner_radius=8)
+
+            room_label = ctk.CTkLabel(
+                room_frame,
+                text=room,
+                font=_font(family="Arial", size=14),
+                text_color="#000000"
             )
-            room_entry.pack(side="left", padx=(0,10))
+            room_label.pack(side="left", padx=10, pady=10)
 
-            add_btn = ctk.CTkButton(
-                add_room_frame,
-                text="+ Add Room",
-                command=lambda: self.add_room(hall_name, room_var, right_panel),
-                width=120,
-                height=35,
-                font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+            delete_btn = ctk.CTkButton(
+                room_frame,
+                text="Delete",
+                command=partial(self.delete_room, hall_name, room, right_panel),
                 fg_color="#ffffff",
                 text_color="#000000",
                 hover_color="#f0f0f0",
-                border_color="#000000",
+                border_color="#FF0000",
                 border_width=2,
-                corner_radius=8
+                corner_radius=8,
+                width=80,
+                height=30,
+                font=_font(family="Arial", size=12)
             )
-            add_btn.pack(side="left")
+            delete_btn.pack(side="right", padx=10, pady=10)
+            row = (room_frame, room_label, delete_btn)
 
-        except Exception as e:
-            print(f"Error refreshing hall details: {str(e)}")
-            messagebox.showerror("Error", f"Failed to refresh hall details: {str(e)}")
+        if before is None:
+            room_frame.pack(fill="x", padx=5, pady=5)
+        else:
+            room_frame.pack(fill="x", padx=5, pady=5, before=before)
+
+        view['rows'][room] = row
+        return row
+
+    def _release_room_row(self, row):
+        """Hide a room row and keep it in the pool for reuse"""
+        row[0].pack_forget()
+        self._hall_view['pool'].append(row)
+
+    def _showing_hall(self, hall_name):
+        """Return True if the hall details view for hall_name is still on screen"""
+        view = self._hall_view
+        return view is not None and view['hall'] == hall_name and view['rooms_frame'].winfo_exists()
+
+    def _load_halls(self):
+        """Return the in-memory halls dict used by the hall editors, reading halls.json on first use"""
+        if self._halls is None:
+            data = self._load_json(DB_FILES['halls'])
+            if not isinstance(data, dict):  # A freshly created file holds an empty list
+                data = {}
+            # Private copy, so edits never touch the shared _load_json data behind self.buildings;
+            # the sets mirror the room lists for constant-time duplicate checks
+            self._halls = {hall: list(rooms) for hall, rooms in data.items()}
+            self._halls_index = {hall: set(rooms) for hall, rooms in data.items()}
+        return self._halls
+
+    def _save_halls(self, halls):
+        """Write halls to halls.json; callers apply the edit in memory only after this succeeds"""
+        _write_atomic(DB_FILES['halls'], _json_dumps(halls))
 
     def delete_room(self, hall_name, room, right_panel):
         try:
-            with open(DB_FILES['halls'], 'r') as f:
-                halls = json.load(f)
+            halls = self._load_halls()
             
-            if hall_name in halls and room in halls[hall_name]:
+            if room in self._halls_index.get(hall_name, ()):
+                self._save_halls({**halls, hall_name: [r for r in halls[hall_name] if r != room]})
+                self._halls_index[hall_name].discard(room)
                 halls[hall_name].remove(room)
                 
-                with open(DB_FILES['halls'], 'w') as f:
-                    json.dump(halls, f, indent=4)
-                
-                self.refresh_hall_details(hall_name, right_panel)
+                # Drop just this room's row when the hall is on screen
+                if self._showing_hall(hall_name) and room in self._hall_view['rows']:
+                    self._release_room_row(self._hall_view['rows'].pop(room))
+                else:
+                    self.refresh_hall_details(hall_name, right_panel)
                 messagebox.showinfo("Success", f"Room {room} has been deleted from {hall_name}")
             else:
                 messagebox.showerror("Error", "Room not found")
@@ -2902,23 +3257,25 @@ class ExamDutyApp:
             return
             
         try:
-            with open(DB_FILES['halls'], 'r') as f:
-                halls = json.load(f)
+            halls = self._load_halls()
             
-            if hall_name not in halls:
-                halls[hall_name] = []
-                
-            if room in halls[hall_name]:
+            if room in self._halls_index.get(hall_name, ()):
                 messagebox.showerror("Error", f"Room {room} already exists in {hall_name}")
                 return
                 
-            halls[hall_name].append(room)
-            
-            with open(DB_FILES['halls'], 'w') as f:
-                json.dump(halls, f, indent=4)
+            self._save_halls({**halls, hall_name: halls.get(hall_name, []) + [room]})
+            halls.setdefault(hall_name, []).append(room)
+            self._halls_index.setdefault(hall_name, set()).add(room)
             
             room_var.set("")  # Clear the entry
-            self.refresh_hall_details(hall_name, right_panel)
+
+            # Insert just the new row, keeping the list sorted, when the hall is on screen
+            if self._showing_hall(hall_name):
+                rows = self._hall_view['rows']
+                following = [r for r in rows if r > room]
+                self._acquire_room_row(hall_name, room, right_panel, before=rows[min(following)][0] if following else None)
+            else:
+                self.refresh_hall_details(hall_name, right_panel)
             messagebox.showinfo("Success", f"Room {room} has been added to {hall_name}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add room: {str(e)}")    
@@ -2941,7 +3298,7 @@ class ExamDutyApp:
         title = ctk.CTkLabel(
             form_frame,
             text="Add New Hall",
-            font=ctk.CTkFont(family="Arial", size=24, weight="bold"),
+            font=_font(family="Arial", size=24, weight="bold"),
             text_color="#000000"
         )
         title.grid(row=0, column=0, columnspan=2, pady=(20, 20))
@@ -2954,7 +3311,7 @@ class ExamDutyApp:
         # Hall name input with label next to text box
         name_label = ctk.CTkLabel(input_frame,
                               text="Hall Name",
-                              font=ctk.CTkFont(family="Arial", size=14),
+                              font=_font(family="Arial", size=14),
                               text_color="#000000")
         name_label.grid(row=0, column=0, padx=(0, 10), pady=10)
 
@@ -2964,7 +3321,7 @@ class ExamDutyApp:
                               placeholder_text="Enter hall name",
                               width=300,
                               height=40,
-                              font=ctk.CTkFont(family="Arial", size=14),
+                              font=_font(family="Arial", size=14),
                               border_color="#000000",
                               border_width=2)
         name_entry.grid(row=0, column=1, sticky="w", pady=10)
@@ -2978,8 +3335,8 @@ class ExamDutyApp:
         # Create Hall button with white background and black border
         add_btn = ctk.CTkButton(button_frame,
                             text="Create Hall",
-                            command=lambda: self.add_hall(hall_name=name_var, halls_scroll=halls_scroll, right_panel=right_panel),
-                            font=ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                            command=partial(self.add_hall, name_var, halls_scroll, right_panel),
+                            font=_font(family="Arial", size=14, weight="bold"),
                             width=140,
                             height=40,
                             fg_color="#ffffff",
@@ -2993,8 +3350,8 @@ class ExamDutyApp:
         # Cancel button with white background and gray border
         cancel_btn = ctk.CTkButton(button_frame,
                                text="Cancel",
-                               command=lambda: self.refresh_hall_details(None, right_panel),
-                               font=ctk.CTkFont(family="Arial", size=14),
+                               command=partial(self.refresh_hall_details, None, right_panel),
+                               font=_font(family="Arial", size=14),
                                width=140,
                                height=40,
                                fg_color="#ffffff",
@@ -3013,23 +3370,21 @@ class ExamDutyApp:
             return
             
         try:
-            with open(DB_FILES['halls'], 'r') as f:
-                halls = json.load(f)
+            halls = self._load_halls()
             
             if hall_name in halls:
                 messagebox.showerror("Error", f"Hall '{hall_name}' already exists")
                 return
                 
+            self._save_halls({**halls, hall_name: []})
             halls[hall_name] = []
-            
-            with open(DB_FILES['halls'], 'w') as f:
-                json.dump(halls, f, indent=4)
+            self._halls_index[hall_name] = set()
             
             # Add new hall button to the list with white background and black border
             hall_btn = ctk.CTkButton(halls_scroll,
                                  text=hall_name,
-                                 command=lambda h=hall_name: self.refresh_hall_details(h, right_panel),
-                                 font=ctk.CTkFont(family="Arial", size=14),
+                                 command=partial(self.refresh_hall_details, hall_name, right_panel),
+                                 font=_font(family="Arial", size=14),
                                  height=40,
                                  fg_color="#ffffff",
                                  text_color="#000000",
@@ -3038,6 +3393,7 @@ class ExamDutyApp:
                                  border_width=2,
                                  corner_radius=8)
             hall_btn.pack(fill="x", pady=5, padx=10)
+            self._hall_buttons[hall_name] = hall_btn
 
             # Show the new hall's details
             self.refresh_hall_details(hall_name, right_panel)
@@ -3046,35 +3402,42 @@ class ExamDutyApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create hall: {str(e)}")    
 
+    def _get_allotment_halls(self):
+        """Return the halls that have classes in allotment.json, rebuilt only when the file changes"""
+        allotment = self._load_json(DB_FILES['allotment'])
+        if allotment is not self._allotment_halls_source:
+            halls = set()
+            if isinstance(allotment, dict):  # Make sure allotment is a dictionary
+                halls = {data['hall'] for data in allotment.values() if isinstance(data, dict) and 'hall' in data}
+            self._allotment_halls = halls
+            self._allotment_halls_source = allotment  # _load_json returns the same object until the file changes
+        return self._allotment_halls
+
     def delete_hall(self, hall_name, right_panel):
         try:
             # Check if hall has any classes assigned
-            with open(DB_FILES['allotment'], 'r') as f:
-                allotment = json.load(f)
-                
-            hall_has_classes = False
-            if isinstance(allotment, dict):  # Make sure allotment is a dictionary
-                for class_name, data in allotment.items():
-                    if isinstance(data, dict) and data.get('hall') == hall_name:  # Check if data is a dictionary and has 'hall'
-                        hall_has_classes = True
-                        break
-            
-            if hall_has_classes:
+            if hall_name in self._get_allotment_halls():
                 messagebox.showerror("Error", f"Cannot delete hall '{hall_name}' as it has classes assigned to it")
                 return
             
             # Delete hall from halls.json
-            with open(DB_FILES['halls'], 'r') as f:
-                halls = json.load(f)
+            halls = self._load_halls()
             
             if hall_name in halls:
+                self._save_halls({hall: rooms for hall, rooms in halls.items() if hall != hall_name})
                 del halls[hall_name]
+                del self._halls_index[hall_name]
                 
-                with open(DB_FILES['halls'], 'w') as f:
-                    json.dump(halls, f, indent=4)
-                
-                # Refresh the halls list
-                self.show_room_configuration()
+                # Drop the hall's button and reset the right panel, leaving the rest of the page as is
+                hall_btn = self._hall_buttons.pop(hall_name, None)
+                if hall_btn is not None and hall_btn.winfo_exists():
+                    hall_btn.destroy()
+                    for widget in right_panel.winfo_children():
+                        widget.destroy()
+                    self._hall_view = None
+                    self._show_hall_welcome(right_panel)
+                else:
+                    self.show_room_configuration()
                 
                 messagebox.showinfo("Success", f"Hall '{hall_name}' has been deleted")
             else:
@@ -3095,16 +3458,19 @@ class ExamDutyApp:
                 messagebox.showerror("Error", "Please fill in all fields")
                 return
 
-            # Save configuration for all dates
+            # Save configuration for all dates in one update
+            settings = {
+                'assessment_name': assessment_name,
+                'exam_time': exam_time,
+                'reporting_time': reporting_time
+            }
+            updates = {}
             for date in self.config_manager.get_configured_dates():
                 config = self.config_manager.get_date_config(date)
                 if config:
-                    config['settings'] = {
-                        'assessment_name': assessment_name,
-                        'exam_time': exam_time,
-                        'reporting_time': reporting_time
-                    }
-                    self.config_manager.set_date_config(date, config)
+                    config['settings'] = dict(settings)
+                    updates[date] = config
+            self.config_manager.set_many(updates)
 
             # Generate both PDFs
             self.generate_allotment_pdf()
@@ -3112,38 +3478,37 @@ class ExamDutyApp:
             
             messagebox.showinfo("Success", "Both PDFs have been generated successfully!")
             
-            # Open the output directory
+            # Open the output directory once the event loop is free again
             output_dir = os.path.join('data')
-            if os.path.exists(output_dir):
-                os.startfile(output_dir)
+            self.app.after(0, self._open_folder, output_dir)
                 
         except Exception as e:
             print(f"Error generating PDFs: {str(e)}")
             print(f"Error details: {traceback.format_exc()}")
             messagebox.showerror("Error", f"Failed to generate PDFs: {str(e)}")
 
+    def _open_folder(self, path):
+        """Open a folder in the file explorer if it exists"""
+        try:
+            if os.path.exists(path):
+                os.startfile(path)
+        except Exception as e:
+            print(f"Error opening folder: {str(e)}")
+
     def run(self):
         self.app.mainloop()
 
+    def on_close(self):
+        """Save pending configuration changes before closing the window"""
+        self.config_manager.flush()
+        self._io_pool.shutdown(wait=False)
+        self.app.destroy()
+
     def update_requirements(self):
         """Update the required staff counts based on selected class configurations"""
         try:
-            total_req = 0
-            female_req = 0
-            
             # Count requirements based on selected classes and modifiers
-            for class_name, modifiers in self.class_modifiers.items():
-                if modifiers['selected'].get():
-                    if modifiers['single_staff'].get():
-                        total_req += 1
-                        if modifiers['girls_only'].get():
-                            female_req += 1
-                    else:
-                        total_req += 2
-                        if modifiers['girls_only'].get():
-                            female_req += 2
-            
-            male_pos = total_req - female_req
+            total_req, female_req, male_pos = self.calculate_staff_requirements()
             
             # Update labels with new counts
             if hasattr(self, 'required_total_label'):
@@ -3162,62 +3527,42 @@ class ExamDutyApp:
     def save_configuration(self):
         """Save the class configuration for selected dates"""
         try:
-            # Get selected classes with their modifiers
-            config = {
-                'rooms': []
-            }
-
-            for class_name, modifiers in self.class_modifiers.items():
-                if modifiers['selected'].get():
-                    config['rooms'].append({
-                        'room_no': class_name,
-                        'girls_only': modifiers['girls_only'].get(),
-                        'single_staff': modifiers['single_staff'].get()
-                    })
+            # Get selected classes with their modifiers, read once for every date
+            rooms = [
+                {
+                    'room_no': class_name,
+                    'girls_only': modifiers['girls_only'].get(),
+                    'single_staff': modifiers['single_staff'].get()
+                } for class_name, modifiers in self.class_modifiers.items()
+                if modifiers['selected'].get()
+            ]
 
-            if not config['rooms']:
+            if not rooms:
                 messagebox.showerror("Error", "No classes configured")
                 return
 
             # Show date selection dialog
-            date_dialog = DateSelectionDialog(self.app, self.selected_dates)
+            date_dialog = DateSelectionDialog(self.app, list(self.selected_dates))
             self.app.wait_window(date_dialog)
             
             if date_dialog.selected_dates:
-                # Save configuration for selected dates
+                # Save configuration for selected dates in one update
+                updates = {}
                 for date in date_dialog.selected_dates:
                     config = self.config_manager.get_date_config(date)
-                    if config:
-                        config['settings'] = {
-                            'reporting_time': '',
-                            'assessment_name': '',
-                            'exam_time': '',
-                            'exam_details': ''
-                        }
-                    else:
-                        config = {
-                            'rooms': [],
-                            'settings': {
-                                'reporting_time': '',
-                                'assessment_name': '',
-                                'exam_time': '',
-                                'exam_details': ''
-                            }
-                        }
-                    config['rooms'] = [
-                        {
-                            'room_no': class_name,
-                            'girls_only': modifiers['girls_only'].get(),
-                            'single_staff': modifiers['single_staff'].get()
-                        } for class_name, modifiers in self.class_modifiers.items() 
-                        if modifiers['selected'].get()
-                    ]
-                    self.config_manager.set_date_config(date, config)
+                    config['settings'] = {
+                        'reporting_time': '',
+                        'assessment_name': '',
+                        'exam_time': '',
+                        'exam_details': ''
+                    }
+                    config['rooms'] = [dict(room) for room in rooms]
+                    updates[date] = config
+                self.config_manager.set_many(updates)
 
                 # Remove configured dates from selected_dates
                 for date in date_dialog.selected_dates:
-                    if date in self.selected_dates:
-                        self.selected_dates.remove(date)
+                    self.selected_dates.pop(date, None)
                 
                 if not self.selected_dates:
                     # All dates configured, move to add details
@@ -3236,13 +3581,11 @@ class ExamDutyApp:
     def download_template(self):
         """Download Excel template for staff details"""
         try:
-            # Template structure
-            template_data = {
-                'staff_name': ['Example: John Doe'],
-                'staff_dept': ['Example: CSE'],
-                'staff_gender': ['Example: M/F']
-            }
-            df = pd.DataFrame(template_data)
+            # Template structure: a header row and one example row
+            template_rows = (
+                ('staff_name', 'staff_dept', 'staff_gender'),
+                ('Example: John Doe', 'Example: CSE', 'Example: M/F')
+            )
             
             # Get save location
             file_path = filedialog.asksaveasfilename(
@@ -3253,7 +3596,12 @@ class ExamDutyApp:
             )
             
             if file_path:
-                df.to_excel(file_path, index=False)
+                # Stream the two rows straight to disk with a write-only workbook
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                for row in template_rows:
+                    ws.append(row)
+                wb.save(file_path)
                 messagebox.showinfo("Success", "Template downloaded successfully!")
         
         except Exception as e:
@@ -3263,6 +3611,11 @@ class ExamDutyApp:
     def upload_staff_file(self):
         """Upload and process staff details from Excel file with multiple department sheets"""
         try:
+            # Only one upload at a time; both would write staff.json and the upload cache
+            if self._upload_future is not None:
+                messagebox.showinfo("Upload in progress", "A staff upload is already running. Please wait for it to finish.")
+                return
+
             # Get file path
             file_path = filedialog.askopenfilename(
                 filetypes=[("Excel files", "*.xlsx *.xls")],
@@ -3272,86 +3625,140 @@ class ExamDutyApp:
             if not file_path:
                 return
 
-            # Read all sheet names from the Excel file
-            xl = pd.ExcelFile(file_path)
-            departments = xl.sheet_names
-            
-            staff_data = []
-            
-            # Create data directory if it doesn't exist
-            os.makedirs("data", exist_ok=True)
-            
-            # Process each department sheet
-            for dept in departments:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=dept)
-                    if df.empty:
-                        continue  # Skip empty sheets
-                    
-                    # Validate columns
-                    if not all(col in df.columns for col in ['Name', 'Gender']):
-                        messagebox.showerror(
-                            "Error", 
-                            f"Invalid format in {dept} sheet. Required columns: Name, Gender"
-                        )
-                        return
+            # Parse and save on the I/O pool so the window keeps responding
+            self._upload_future = self._io_pool.submit(self._import_staff_file, file_path)
+            self.app.after(self.UPLOAD_POLL_MS, self._finish_staff_upload, self._upload_future)
+        
+        except Exception as e:
+            print(f"Error uploading staff details: {str(e)}")
+            print(f"Error details: {traceback.format_exc()}")
+            messagebox.showerror("Error", f"Failed to upload staff details: {str(e)}")
 
-                    # Convert DataFrame to list of dictionaries
-                    for index, row in df.iterrows():
-                        staff_member = {
-                            'staff_name': str(row['Name']).strip(),
-                            'staff_dept': dept.strip(),  # Use sheet name as department name
-                            'staff_gender': str(row['Gender']).strip().upper()
-                        }
-                        
-                        # Normalize gender values
-                        if staff_member['staff_gender'] in ['M', 'MALE', 'MR']:
-                            staff_member['staff_gender'] = 'M'
-                        elif staff_member['staff_gender'] in ['F', 'FEMALE', 'MS', 'MRS']:
-                            staff_member['staff_gender'] = 'F'
-                        
-                        # Only add if we have valid name and gender
-                        if staff_member['staff_name'] and staff_member['staff_gender'] in ['M', 'F']:
-                            staff_data.append(staff_member)
-                            
-                except ValueError:
-                    continue  # Skip if sheet does not exist
-                except Exception as e:
-                    print(f"Error processing {dept} sheet: {str(e)}")
-                    continue
-            
-            if not staff_data:
-                messagebox.showerror(
-                    "Error", 
-                    "No valid staff data found in the Excel file. Please check the file format."
+    def _import_staff_file(self, file_path):
+        """
+        Read a staff workbook and save it to staff.json; runs off the UI thread, so no Tk calls
+        Returns: tuple (staff_count, error_message)
+        """
+        # Create data directory if it doesn't exist
+        os.makedirs("data", exist_ok=True)
+
+        # Hash the workbook; an identical re-upload reuses its earlier result
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"parser-v{UPLOAD_PARSER_VERSION}".encode())
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        key = digest.hexdigest()
+
+        try:
+            upload_cache = _json_loads(Path(UPLOAD_CACHE_FILE).read_bytes())
+        except (FileNotFoundError, ValueError):
+            upload_cache = {}
+
+        entry = upload_cache.pop(key, None)
+        if entry is not None and os.path.exists(entry['path']):
+            _write_atomic(DB_FILES['staff'], Path(entry['path']).read_bytes())
+            upload_cache[key] = entry  # Re-insert as most recently used
+            _write_atomic(UPLOAD_CACHE_FILE, _json_dumps(upload_cache, compact=True))
+            return entry['count'], None
+
+        # Read every department sheet from the Excel file in a single parse
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        
+        staff_data = []
+        
+        # Process each department sheet
+        for dept, df in sheets.items():
+            try:
+                if df.empty:
+                    continue  # Skip empty sheets
+                
+                # Validate columns
+                if not all(col in df.columns for col in ['Name', 'Gender']):
+                    return 0, f"Invalid format in {dept} sheet. Required columns: Name, Gender"
+
+                # Normalize names and genders column-wise; rows without a name
+                # or with an unrecognised gender are dropped
+                df = df[['Name', 'Gender']].dropna(subset=['Name'])
+                names = df['Name'].astype(str).str.strip()
+                genders = df['Gender'].astype(str).str.strip().str.upper().map(UPLOAD_GENDER_CODES)
+                valid = (names != '') & genders.notna()
+
+                # Use sheet name as department name
+                dept_name = dept.strip()
+                staff_data.extend(
+                    {'staff_name': name, 'staff_dept': dept_name, 'staff_gender': gender}
+                    for name, gender in zip(names[valid], genders[valid])
                 )
-                return
-            
-            # Save to JSON file
-            with open('data/staff.json', 'w') as f:
-                json.dump(staff_data, f, indent=4)
-            
-            messagebox.showinfo(
-                "Success", 
-                f"Staff details uploaded successfully! {len(staff_data)} staff members imported."
-            )
-            
-            # Return to home page
-            self.create_home_page()
+                        
+            except Exception as e:
+                print(f"Error processing {dept} sheet: {str(e)}")
+                continue
+        
+        if not staff_data:
+            return 0, "No valid staff data found in the Excel file. Please check the file format."
         
+        # Save to JSON file
+        payload = _json_dumps(staff_data)
+        _write_atomic(DB_FILES['staff'], payload)
+
+        # Remember this result, dropping the least recently used workbooks beyond the limit
+        os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+        cached_path = os.path.join(UPLOAD_CACHE_DIR, f"{key}.json")
+        _write_atomic(cached_path, payload)
+        upload_cache[key] = {'path': cached_path, 'count': len(staff_data)}
+        while len(upload_cache) > UPLOAD_CACHE_SIZE:
+            stale = upload_cache.pop(next(iter(upload_cache)))
+            try:
+                os.remove(stale['path'])
+            except OSError:
+                pass
+        _write_atomic(UPLOAD_CACHE_FILE, _json_dumps(upload_cache, compact=True))
+        return len(staff_data), None
+
+    def _finish_staff_upload(self, future):
+        """Report the result of a background staff upload once it completes, polling from the UI thread"""
+        if not future.done():
+            self.app.after(self.UPLOAD_POLL_MS, self._finish_staff_upload, future)
+            return
+
+        self._upload_future = None
+        try:
+            staff_count, error_message = future.result()
         except pd.errors.EmptyDataError:
             messagebox.showerror("Error", "The selected file is empty")
+            return
         except Exception as e:
             print(f"Error uploading staff details: {str(e)}")
             print(f"Error details: {traceback.format_exc()}")
             messagebox.showerror("Error", f"Failed to upload staff details: {str(e)}")
+            return
+
+        if error_message:
+            messagebox.showerror("Error", error_message)
+            return
+
+        self._staff_cache = None
+        self._preload_json('staff')
+        
+        messagebox.showinfo(
+            "Success", 
+            f"Staff details uploaded successfully! {staff_count} staff members imported."
+        )
+        
+        # Return to home page, unless the user has already moved on from the upload page
+        if self._upload_page is not None and self._upload_page.winfo_exists():
+            self.create_home_page()
 
     def upload_staff_details(self):
         """Create the upload staff details page"""
         try:
             # Clear existing widgets
-            for widget in self.app.winfo_children():
-                widget.destroy()
+            self._clear_window()
+
+            # Theme colours used by every widget on this page
+            theme = self.UI_THEME
+            text_color = theme['button_fg']
 
             # Create main container
             main_container = ctk.CTkFrame(self.app, fg_color="transparent")
@@ -3363,10 +3770,10 @@ class ExamDutyApp:
             # Content frame with border
             content_frame = ctk.CTkFrame(
                 main_container,
-                fg_color=self.UI_THEME['content_bg'],
+                fg_color=theme['content_bg'],
                 corner_radius=15,
                 border_width=2,
-                border_color=self.UI_THEME['button_border']
+                border_color=theme['button_border']
             )
             content_frame.pack(fill="both", expand=True, padx=20)
 
@@ -3378,11 +3785,11 @@ class ExamDutyApp:
             ctk.CTkLabel(
                 instruction_frame,
                 text="Instructions:",
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold"),
-                text_color=self.UI_THEME['button_fg']
+                font=_font(family="Arial", size=16, weight="bold"),
+                text_color=text_color
             ).pack(anchor="w", pady=(0, 10))
 
-            # Instructions
+            # Instructions, shown as one multi-line label
             instructions = [
                 "1. Download the template Excel file",
                 "2. Fill in the staff details in the template:",
@@ -3393,26 +3800,29 @@ class ExamDutyApp:
                 "4. Upload the filled Excel file using the button below"
             ]
 
-            for instruction in instructions:
-                ctk.CTkLabel(
-                    instruction_frame,
-                    text=instruction,
-                    font=ctk.CTkFont(family="Arial", size=14),
-                    text_color=self.UI_THEME['button_fg']
-                ).pack(anchor="w", pady=5)
+            ctk.CTkLabel(
+                instruction_frame,
+                text="\n".join(instructions),
+                justify="left",
+                font=_font(family="Arial", size=14),
+                text_color=text_color
+            ).pack(anchor="w", pady=5)
 
             # Button frame
             button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
             button_frame.pack(fill="x", padx=40, pady=30)
 
-            # Button style
+            # Button style, shared by all three buttons
             button_style = {
-                "font": ctk.CTkFont(family="Arial", size=14, weight="bold"),
+                "font": _font(family="Arial", size=14, weight="bold"),
                 "width": 200,
                 "height": 40,
                 "corner_radius": 8,
                 "border_width": 2,
-                "border_color": self.UI_THEME['button_border']
+                "border_color": theme['button_border'],
+                "fg_color": theme['button_bg'],
+                "text_color": text_color,
+                "hover_color": theme['button_hover']
             }
 
             # Download Template button
@@ -3420,9 +3830,6 @@ class ExamDutyApp:
                 button_frame,
                 text="↓ Download Template",
                 command=self.download_template,  # Direct method reference, no lambda
-                fg_color=self.UI_THEME['button_bg'],
-                text_color=self.UI_THEME['button_fg'],
-                hover_color=self.UI_THEME['button_hover'],
                 **button_style
             )
             download_btn.pack(pady=10)
@@ -3432,9 +3839,6 @@ class ExamDutyApp:
                 button_frame,
                 text="↑ Upload Staff Details",
                 command=self.upload_staff_file,  # Direct method reference, no lambda
-                fg_color=self.UI_THEME['button_bg'],
-                text_color=self.UI_THEME['button_fg'],
-                hover_color=self.UI_THEME['button_hover'],
                 **button_style
             )
             upload_btn.pack(pady=10)
@@ -3444,9 +3848,6 @@ class ExamDutyApp:
                 button_frame,
                 text="← Back",
                 command=self.create_home_page,  # Direct method reference, no lambda
-                fg_color=self.UI_THEME['button_bg'],
-                text_color=self.UI_THEME['button_fg'],
-                hover_color=self.UI_THEME['button_hover'],
                 **button_style
             )
             back_btn.pack(pady=10)